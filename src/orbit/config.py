@@ -31,6 +31,7 @@ OSRM_TIMEOUT_SECONDS = 10
 
 # Cache settings
 CACHE_TTL_DAYS = 7
+NEGATIVE_CACHE_TTL_DAYS = 15 / (24 * 60)  # 15 minutes for failed lookups
 
 # Default settings
 DEFAULT_TIMEZONE = "America/Chicago"
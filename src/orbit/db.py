@@ -460,20 +460,28 @@ def get_plan(plan_date: date) -> Optional[Plan]:
         return _row_to_plan(row) if row else None
 
 
+_PLAN_INSERT = """
+    INSERT OR REPLACE INTO plans
+    (id, plan_date, generated_at, assumptions_json)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _plan_row(plan: Plan) -> tuple:
+    """Convert a Plan to plans column values."""
+    return (
+        str(plan.id),
+        plan.plan_date.isoformat(),
+        plan.generated_at.isoformat(),
+        plan.assumptions_json,
+    )
+
+
 def save_plan(plan: Plan):
     """Save a plan."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO plans
-            (id, plan_date, generated_at, assumptions_json)
-            VALUES (?, ?, ?, ?)
-        """, (
-            str(plan.id),
-            plan.plan_date.isoformat(),
-            plan.generated_at.isoformat(),
-            plan.assumptions_json,
-        ))
+        cursor.execute(_PLAN_INSERT, _plan_row(plan))
 
 
 def get_plan_items(plan_id: UUID) -> list[PlanItem]:
@@ -488,31 +496,48 @@ def get_plan_items(plan_id: UUID) -> list[PlanItem]:
         return [_row_to_plan_item(row) for row in rows]
 
 
+_PLAN_ITEM_INSERT = """
+    INSERT OR REPLACE INTO plan_items
+    (id, plan_id, order_index, start_dt, end_dt, type, task_id, title,
+     from_place, to_place, distance_km, travel_minutes, lat, lon)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _plan_item_row(item: PlanItem) -> tuple:
+    """Convert a PlanItem to plan_items column values."""
+    return (
+        str(item.id),
+        str(item.plan_id),
+        item.order_index,
+        item.start_dt.isoformat(),
+        item.end_dt.isoformat(),
+        item.type,
+        str(item.task_id) if item.task_id else None,
+        item.title,
+        item.from_place,
+        item.to_place,
+        item.distance_km,
+        item.travel_minutes,
+        item.lat,
+        item.lon,
+    )
+
+
 def save_plan_item(item: PlanItem):
     """Save a plan item."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO plan_items
-            (id, plan_id, order_index, start_dt, end_dt, type, task_id, title,
-             from_place, to_place, distance_km, travel_minutes, lat, lon)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            str(item.id),
-            str(item.plan_id),
-            item.order_index,
-            item.start_dt.isoformat(),
-            item.end_dt.isoformat(),
-            item.type,
-            str(item.task_id) if item.task_id else None,
-            item.title,
-            item.from_place,
-            item.to_place,
-            item.distance_km,
-            item.travel_minutes,
-            item.lat,
-            item.lon,
-        ))
+        cursor.execute(_PLAN_ITEM_INSERT, _plan_item_row(item))
+
+
+def replace_plan(plan: Plan, items: list[PlanItem]):
+    """Save a plan and replace its items in a single transaction."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_PLAN_INSERT, _plan_row(plan))
+        cursor.execute("DELETE FROM plan_items WHERE plan_id = ?", (str(plan.id),))
+        cursor.executemany(_PLAN_ITEM_INSERT, [_plan_item_row(item) for item in items])
 
 
 def delete_plan_items(plan_id: UUID):
@@ -565,7 +590,7 @@ def get_cache(key: str) -> Optional[str]:
         return row["value"] if row else None
 
 
-def set_cache(key: str, value: str, ttl_days: int = 7):
+def set_cache(key: str, value: str, ttl_days: float = 7):
     """Set a cached value with expiration."""
     from datetime import timedelta
     expires_at = datetime.now() + timedelta(days=ttl_days)
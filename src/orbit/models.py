@@ -138,6 +138,7 @@ class PlaceSearchResult(BaseModel):
     source: str = "nominatim"
     osm_id: Optional[str] = None
     place_type: Optional[str] = None
+    country_code: Optional[str] = None  # ISO 3166-1 alpha-2, e.g. "us"
 
 
 class RouteResult(BaseModel):
@@ -1,9 +1,17 @@
 """Places service - geocoding, search, and place management."""
 
 import hashlib
-import json
+import logging
+import math
+import re
+import struct
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
 import requests
@@ -12,33 +20,296 @@ from orbit import db
 from orbit.config import (
     CACHE_TTL_DAYS,
     DEFAULT_SEARCH_RADIUS_KM,
+    NEGATIVE_CACHE_TTL_DAYS,
     NOMINATIM_BASE_URL,
     NOMINATIM_RATE_LIMIT_SECONDS,
     NOMINATIM_USER_AGENT,
 )
 from orbit.models import Place, PlaceSearchResult, Settings
+from orbit.services import routing
+from orbit.utils.jsonio import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
 
 # Track last request time for rate limiting
 _last_request_time: float = 0
 
+# Nominatim's usage policy allows one request at a time, even across threads
+_request_lock = threading.Lock()
+
+# Request pieces that never change between calls
+_SEARCH_URL = f"{NOMINATIM_BASE_URL}/search"
+_REVERSE_URL = f"{NOMINATIM_BASE_URL}/reverse"
+_HEADERS = {"User-Agent": NOMINATIM_USER_AGENT}
+_BASE_SEARCH_PARAMS = {"format": "json", "addressdetails": 1}
+
+# Cache value recording a recent failed lookup (see NEGATIVE_CACHE_TTL_DAYS)
+_FAILED_LOOKUP = "!failed"
+
+# Reverse geocode cache keys round coordinates to this many decimals (~1 m),
+# so GPS jitter around the same spot shares one cache entry
+_REVERSE_KEY_DECIMALS = 5
+
+# OSM type buckets used to derive geocode precision
+_EXACT_TYPES = frozenset({"house", "building", "apartments", "residential", "commercial"})
+_STREET_TYPES = frozenset({"road", "street", "way", "path", "highway"})
+_CITY_TYPES = frozenset({"city", "town", "village", "suburb", "neighbourhood", "hamlet"})
+
+# Street type words and abbreviations (matched as whole words)
+_STREET_WORDS = frozenset({
+    "street", "st", "st.", "avenue", "ave", "ave.", "road", "rd", "rd.",
+    "drive", "dr", "dr.", "lane", "ln", "ln.", "boulevard", "blvd", "blvd.",
+    "way", "court", "ct", "ct.", "highway", "hwy", "hwy.", "parkway", "pkwy"
+})
+
+# US state abbreviations
+_US_STATES = frozenset({
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+})
+
+# Full US state names (and DC) mapped to their postal codes
+_US_STATE_NAMES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT", "delaware": "DE",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID",
+    "illinois": "IL", "indiana": "IN", "iowa": "IA", "kansas": "KS",
+    "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK",
+    "oregon": "OR", "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT",
+    "vermont": "VT", "virginia": "VA", "washington": "WA", "west virginia": "WV",
+    "wisconsin": "WI", "wyoming": "WY", "district of columbia": "DC",
+}
+
+# State codes a structured query may use: the states plus DC
+_STATE_CODES = _US_STATES | {"DC"}
+
+_US_COUNTRY_NAMES = frozenset({"us", "usa", "united states", "united states of america"})
+
+# Any address signal in one scan: a digit in the first word, or a whole word
+# that is a 5-digit zip, a street type or a state abbreviation
+_ADDRESS_RE = re.compile(
+    r"^\s*\S*\d|(?<!\S)(?:\d{5}|"
+    + "|".join(re.escape(w) for w in sorted(_STREET_WORDS | _US_STATES, key=len, reverse=True))
+    + r")(?!\S)",
+    re.IGNORECASE,
+)
+
+
+class _TTLMemo:
+    """
+    Thread-safe in-process memo bounded in size (least recently used goes
+    first) and in time (entries expire after ttl_seconds).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> tuple[bool, object]:
+        """Return (True, value) for a live entry, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Geocode results memoized in front of the SQLite cache, for no longer
+# than the SQLite cache would keep them
+_GEOCODE_MEMO = _TTLMemo(maxsize=2048, ttl_seconds=CACHE_TTL_DAYS * 24 * 60 * 60)
+
+# Reverse geocode results, keyed on rounded coordinates, on the same terms
+_REVERSE_MEMO = _TTLMemo(maxsize=2048, ttl_seconds=CACHE_TTL_DAYS * 24 * 60 * 60)
+
 
 def _rate_limit():
     """Enforce rate limiting for Nominatim API."""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
+    elapsed = time.monotonic() - _last_request_time
     if elapsed < NOMINATIM_RATE_LIMIT_SECONDS:
         time.sleep(NOMINATIM_RATE_LIMIT_SECONDS - elapsed)
-    _last_request_time = time.time()
 
 
-def _get_cache_key(prefix: str, *args) -> str:
-    """Generate a cache key from prefix and arguments."""
-    content = json.dumps(args, sort_keys=True)
-    hash_val = hashlib.md5(content.encode()).hexdigest()[:16]
-    return f"{prefix}:{hash_val}"
+def _nominatim_get(url: str, params: dict):
+    """
+    Issue a rate-limited GET request to Nominatim and parse the JSON body.
 
+    The rate-limit clock only advances once a response has come back, so a
+    request that fails before reaching the server doesn't delay the next one.
 
-@dataclass
+    Raises:
+        requests.RequestException: On network or HTTP errors, or a body
+            that isn't valid JSON
+    """
+    global _last_request_time
+    with _request_lock:
+        _rate_limit()
+        response = requests.get(
+            url,
+            params=params,
+            headers=_HEADERS,
+            timeout=10,
+        )
+        _last_request_time = time.monotonic()
+
+    response.raise_for_status()
+    try:
+        return json_loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+
+
+def _split_state(tokens: list[str]) -> Optional[tuple[list[str], str]]:
+    """
+    Split a trailing US state (code or full name) off a list of words.
+
+    Returns:
+        (words before the state, state code), or None if the words don't
+        end in a state. Longer names win, so "West Virginia" isn't "Virginia"
+    """
+    for size in (3, 2, 1):
+        if len(tokens) < size:
+            continue
+        name = " ".join(tokens[-size:])
+        code = _US_STATE_NAMES.get(name.lower())
+        if code is None and size == 1 and name.upper() in _STATE_CODES:
+            code = name.upper()
+        if code:
+            return tokens[:-size], code
+    return None
+
+
+def _structured_params_from_address(text: str) -> Optional[dict]:
+    """
+    Split a US-style address into Nominatim structured query fields.
+
+    Handles "street, city, state [zip]" (as in "123 Main St, Austin, TX
+    78701" or "..., Austin, Texas") and "street, city state [zip]". Structured
+    queries are cheaper for Nominatim to answer than free text, but a wrong
+    split gets cached, so anything less regular (a county, a unit line,
+    a missing state) is left to the free-text query.
+
+    Returns:
+        Dict of structured params, or None if the address doesn't parse
+        unambiguously
+    """
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if parts and parts[-1].lower() in _US_COUNTRY_NAMES:
+        parts = parts[:-1]
+    if len(parts) not in (2, 3):
+        return None
+
+    street_tokens = parts[0].split()
+    if not street_tokens[0].isdigit() or _STREET_WORDS.isdisjoint(t.lower() for t in street_tokens[1:]):
+        return None
+
+    # Trailing "TX 78701", "Texas" or "Austin TX" (city only without a comma)
+    region = parts[-1].split()
+    postalcode = None
+    if region and len(region[-1]) == 5 and region[-1].isdigit():
+        postalcode = region.pop()
+    split = _split_state(region)
+    if split is None:
+        return None
+    city_tokens, state = split
+
+    if len(parts) == 3:
+        if city_tokens:
+            return None
+        city = parts[1]
+    else:
+        if not city_tokens:
+            return None
+        city = " ".join(city_tokens)
+
+    params = {"street": parts[0], "city": city, "state": state}
+    if postalcode:
+        params["postalcode"] = postalcode
+    params["country"] = "us"
+    return params
+
+
+def _search_address(address: str, params: dict) -> list[dict]:
+    """
+    Run a Nominatim search for an address.
+
+    Uses a structured query when the address can be split into fields,
+    falling back to a free-text query if that finds nothing.
+
+    Args:
+        address: Address string to search for
+        params: Common search params (format, limit, ...)
+
+    Returns:
+        Raw Nominatim result dicts
+    """
+    structured = _structured_params_from_address(address)
+    if structured:
+        results = _nominatim_get(_SEARCH_URL, params={**params, **structured})
+        if results:
+            return results
+
+    return _nominatim_get(_SEARCH_URL, params={**params, "q": address})
+
+
+def _get_cache_key(prefix: str, *args) -> str:
+    """
+    Generate a cache key from prefix and arguments.
+
+    Arguments are fed straight into the hash instead of being JSON-encoded
+    first. Each one is preceded by a type tag, and strings by their length,
+    so that e.g. "1" and 1.0, or ("a\x1fb",) and ("a", "b"), can never
+    produce the same key. The key is not security-sensitive, so BLAKE2b is
+    used for speed.
+    """
+    h = hashlib.blake2b(digest_size=10, usedforsecurity=False)
+    h.update(prefix.encode())
+    for arg in args:
+        if arg is None:
+            h.update(b"\x00")
+        elif isinstance(arg, (int, float)):
+            h.update(b"\x1e")
+            h.update(struct.pack("<d", float(arg)))
+        else:
+            if isinstance(arg, str):
+                h.update(b"\x1f")
+                data = arg.encode()
+            else:
+                h.update(b"\x1d")
+                data = repr(arg).encode()
+            h.update(struct.pack("<I", len(data)))
+            h.update(data)
+    return f"{prefix}:{h.hexdigest()}"
+
+
+@dataclass(slots=True)
 class GeocodedAddress:
     """Result of address geocoding with precision info."""
     name: str
@@ -67,20 +338,38 @@ class GeocodedAddress:
         )
 
 
+# Version tag for cached GeocodedAddress lists; bump when the row layout changes
+_GEOCODED_CACHE_VERSION = "g1:"
+
+# Cached rows follow the dataclass field order, so they can't drift from it
+_geocoded_row = attrgetter(*(f.name for f in fields(GeocodedAddress)))
+
+
+def _dump_geocoded(geocoded: list[GeocodedAddress]) -> str:
+    """Serialize geocoded results for the cache as compact positional rows."""
+    rows = [_geocoded_row(g) for g in geocoded]
+    return _GEOCODED_CACHE_VERSION + json_dumps(rows)
+
+
+def _load_geocoded(cached: str) -> Optional[list[GeocodedAddress]]:
+    """Deserialize cached geocoded results, or None if the format is stale."""
+    if not cached.startswith(_GEOCODED_CACHE_VERSION):
+        return None
+    rows = json_loads(cached[len(_GEOCODED_CACHE_VERSION):])
+    return [GeocodedAddress(*row) for row in rows]
+
+
+@lru_cache(maxsize=256)
 def _get_precision_from_type(osm_type: str, address_type: str) -> str:
     """Determine precision level from OSM type and address type."""
-    exact_types = {"house", "building", "apartments", "residential", "commercial"}
-    street_types = {"road", "street", "way", "path", "highway"}
-    city_types = {"city", "town", "village", "suburb", "neighbourhood", "hamlet"}
-
     type_lower = (osm_type or "").lower()
     addr_lower = (address_type or "").lower()
 
-    if type_lower in exact_types or addr_lower in exact_types:
+    if type_lower in _EXACT_TYPES or addr_lower in _EXACT_TYPES:
         return "exact"
-    elif type_lower in street_types or addr_lower in street_types:
+    elif type_lower in _STREET_TYPES or addr_lower in _STREET_TYPES:
         return "street"
-    elif type_lower in city_types or addr_lower in city_types:
+    elif type_lower in _CITY_TYPES or addr_lower in _CITY_TYPES:
         return "city"
     return "region"
 
@@ -106,18 +395,12 @@ def geocode_address_multi(
     cache_key = _get_cache_key("geocode_multi", address, limit, bias_lat, bias_lon)
     cached = db.get_cache(cache_key)
     if cached:
-        data = json.loads(cached)
-        return [GeocodedAddress(**item) for item in data] if data else []
-
-    _rate_limit()
+        geocoded = _load_geocoded(cached)
+        if geocoded is not None:
+            return geocoded
 
     try:
-        params = {
-            "q": address,
-            "format": "json",
-            "limit": limit,
-            "addressdetails": 1,
-        }
+        params = {**_BASE_SEARCH_PARAMS, "limit": limit}
 
         # Add viewbox bias if coordinates provided
         if bias_lat is not None and bias_lon is not None:
@@ -126,14 +409,7 @@ def geocode_address_multi(
             params["viewbox"] = f"{bias_lon - delta},{bias_lat + delta},{bias_lon + delta},{bias_lat - delta}"
             params["bounded"] = 0  # Prefer but don't require results in viewbox
 
-        response = requests.get(
-            f"{NOMINATIM_BASE_URL}/search",
-            params=params,
-            headers={"User-Agent": NOMINATIM_USER_AGENT},
-            timeout=10,
-        )
-        response.raise_for_status()
-        results = response.json()
+        results = _search_address(address, params)
 
         geocoded = []
         for result in results:
@@ -152,38 +428,34 @@ def geocode_address_multi(
                 importance=float(result.get("importance", 0)),
             ))
 
-        # Sort by importance (higher first), then by precision
+        # Sort by precision first; within the same precision prefer the
+        # closest result to the bias point (if any), then higher importance
         precision_order = {"exact": 0, "street": 1, "city": 2, "region": 3}
-        geocoded.sort(key=lambda x: (precision_order.get(x.precision, 4), -x.importance))
-
-        # If bias point provided, also factor in distance
         if bias_lat is not None and bias_lon is not None and geocoded:
-            from orbit.services import routing
-            for g in geocoded:
-                g._distance = routing.haversine_distance(bias_lat, bias_lon, g.lat, g.lon)
-            # Re-sort: precision first, then distance for same precision
-            geocoded.sort(key=lambda x: (precision_order.get(x.precision, 4), getattr(x, '_distance', 999)))
+            distances = routing.haversine_distances(
+                bias_lat, bias_lon, [(g.lat, g.lon) for g in geocoded]
+            )
+            order = sorted(
+                range(len(geocoded)),
+                key=lambda i: (
+                    precision_order.get(geocoded[i].precision, 4),
+                    distances[i],
+                    -geocoded[i].importance,
+                ),
+            )
+            geocoded = [geocoded[i] for i in order]
+        else:
+            geocoded.sort(key=lambda x: (precision_order.get(x.precision, 4), -x.importance))
 
         # Cache results
-        cache_data = [
-            {
-                "name": g.name,
-                "address": g.address,
-                "lat": g.lat,
-                "lon": g.lon,
-                "precision": g.precision,
-                "osm_id": g.osm_id,
-                "place_type": g.place_type,
-                "importance": g.importance,
-            }
-            for g in geocoded
-        ]
-        db.set_cache(cache_key, json.dumps(cache_data), CACHE_TTL_DAYS)
+        db.set_cache(cache_key, _dump_geocoded(geocoded), CACHE_TTL_DAYS)
 
         return geocoded
 
     except requests.RequestException as e:
-        print(f"Geocoding error: {e}")
+        logger.warning("Geocoding error: %s", e)
+        # Remember the failure briefly so retries don't pay the rate limit + timeout again
+        db.set_cache(cache_key, _dump_geocoded([]), NEGATIVE_CACHE_TTL_DAYS)
         return []
 
 
@@ -191,55 +463,87 @@ def geocode_address(address: str) -> Optional[PlaceSearchResult]:
     """
     Geocode an address to coordinates using Nominatim.
 
+    Results are memoized in-process (keyed on the case-folded address) in
+    front of the SQLite cache, so repeat lookups within a session skip both
+    the database and the network.
+
     Args:
         address: Full address string to geocode
 
     Returns:
         PlaceSearchResult if found, None otherwise
     """
-    cache_key = _get_cache_key("geocode", address)
+    address = address.strip()
+    key = address.lower()
+    found, result = _GEOCODE_MEMO.get(key)
+    if not found:
+        try:
+            result = _geocode_uncached(address, key)
+        except requests.RequestException as e:
+            # Not memoized, so a transient failure is retried next time
+            logger.warning("Geocoding error: %s", e)
+            return None
+        _GEOCODE_MEMO.put(key, result)
+    # Hand out a copy so callers can't mutate the memoized instance
+    return result.model_copy() if result else None
+
+
+def _geocode_uncached(address: str, key: str) -> Optional[PlaceSearchResult]:
+    """
+    Geocode an address as typed, checking the SQLite cache (under the
+    case-folded key) first.
+
+    Raises:
+        requests.RequestException: On network errors
+    """
+    cache_key = _get_cache_key("geocode", key)
     cached = db.get_cache(cache_key)
     if cached:
-        data = json.loads(cached)
+        data = json_loads(cached)
         return PlaceSearchResult(**data) if data else None
 
-    _rate_limit()
+    results = _search_address(address, {**_BASE_SEARCH_PARAMS, "limit": 1, "dedupe": 1})
 
-    try:
-        response = requests.get(
-            f"{NOMINATIM_BASE_URL}/search",
-            params={
-                "q": address,
-                "format": "json",
-                "limit": 1,
-                "addressdetails": 1,
-            },
-            headers={"User-Agent": NOMINATIM_USER_AGENT},
-            timeout=10,
+    if results:
+        result = results[0]
+        place_result = PlaceSearchResult(
+            name=result.get("display_name", address).split(",")[0],
+            address=result.get("display_name", address),
+            lat=float(result["lat"]),
+            lon=float(result["lon"]),
+            source="nominatim",
+            osm_id=str(result.get("osm_id")),
+            place_type=result.get("type"),
+            country_code=(result.get("address") or {}).get("country_code"),
         )
-        response.raise_for_status()
-        results = response.json()
+        db.set_cache(cache_key, place_result.model_dump_json(), CACHE_TTL_DAYS)
+        return place_result
+    else:
+        db.set_cache(cache_key, "null", CACHE_TTL_DAYS)
+        return None
 
-        if results:
-            result = results[0]
-            place_result = PlaceSearchResult(
-                name=result.get("display_name", address).split(",")[0],
-                address=result.get("display_name", address),
-                lat=float(result["lat"]),
-                lon=float(result["lon"]),
-                source="nominatim",
-                osm_id=str(result.get("osm_id")),
-                place_type=result.get("type"),
-            )
-            db.set_cache(cache_key, place_result.model_dump_json(), CACHE_TTL_DAYS)
-            return place_result
-        else:
-            db.set_cache(cache_key, "null", CACHE_TTL_DAYS)
-            return None
 
-    except requests.RequestException as e:
-        print(f"Geocoding error: {e}")
-        return None
+def geocode_batch(addresses: list[str]) -> list[Optional[PlaceSearchResult]]:
+    """
+    Geocode several addresses.
+
+    Duplicates are looked up once. Lookups run on a small thread pool:
+    Nominatim requests are still issued one at a time, but response parsing
+    and cache writes for one address overlap the request for the next, and
+    cached addresses don't wait behind uncached ones.
+
+    Args:
+        addresses: Address strings to geocode
+
+    Returns:
+        PlaceSearchResult (or None if not found) for each address, in order
+    """
+    unique = list(dict.fromkeys(addresses))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        found = dict(zip(unique, executor.map(geocode_address, unique)))
+
+    # Give each position its own copy when an address appears more than once
+    return [found[a].model_copy() if found[a] else None for a in addresses]
 
 
 def search_places_nearby(
@@ -265,33 +569,25 @@ def search_places_nearby(
     cache_key = _get_cache_key("search", query, center_lat, center_lon, radius_km, limit)
     cached = db.get_cache(cache_key)
     if cached:
-        data = json.loads(cached)
+        data = json_loads(cached)
         return [PlaceSearchResult(**item) for item in data]
 
-    _rate_limit()
-
     # Calculate bounding box
     lat_delta = radius_km / 111.0  # Approximate km per degree latitude
-    lon_delta = radius_km / (111.0 * abs(center_lat) * 0.0174533) if center_lat != 0 else radius_km / 111.0
+    # A degree of longitude shrinks with cos(latitude); clamp near the poles
+    cos_lat = math.cos(math.radians(center_lat))
+    lon_delta = radius_km / (111.0 * max(cos_lat, 1e-6))
 
     viewbox = f"{center_lon - lon_delta},{center_lat + lat_delta},{center_lon + lon_delta},{center_lat - lat_delta}"
 
     try:
-        response = requests.get(
-            f"{NOMINATIM_BASE_URL}/search",
-            params={
-                "q": query,
-                "format": "json",
-                "limit": limit,
-                "addressdetails": 1,
-                "viewbox": viewbox,
-                "bounded": 1,
-            },
-            headers={"User-Agent": NOMINATIM_USER_AGENT},
-            timeout=10,
-        )
-        response.raise_for_status()
-        results = response.json()
+        results = _nominatim_get(_SEARCH_URL, params={
+            **_BASE_SEARCH_PARAMS,
+            "q": query,
+            "limit": limit,
+            "viewbox": viewbox,
+            "bounded": 1,
+        })
 
         place_results = []
         for result in results:
@@ -303,17 +599,19 @@ def search_places_nearby(
                 source="nominatim",
                 osm_id=str(result.get("osm_id")),
                 place_type=result.get("type"),
+                country_code=(result.get("address") or {}).get("country_code"),
             )
             place_results.append(place_result)
 
         # Cache the results
         cache_data = [p.model_dump() for p in place_results]
-        db.set_cache(cache_key, json.dumps(cache_data), CACHE_TTL_DAYS)
+        db.set_cache(cache_key, json_dumps(cache_data), CACHE_TTL_DAYS)
 
         return place_results
 
     except requests.RequestException as e:
-        print(f"Place search error: {e}")
+        logger.warning("Place search error: %s", e)
+        db.set_cache(cache_key, json_dumps([]), NEGATIVE_CACHE_TTL_DAYS)
         return []
 
 
@@ -353,6 +651,9 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     """
     Get address from coordinates using reverse geocoding.
 
+    Coordinates are rounded to 5 decimals (~1 m) before lookup, so nearby
+    GPS fixes share both the in-process memo and the SQLite cache entry.
+
     Args:
         lat: Latitude
         lon: Longitude
@@ -360,34 +661,43 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     Returns:
         Address string if found, None otherwise
     """
+    key = (round(lat, _REVERSE_KEY_DECIMALS), round(lon, _REVERSE_KEY_DECIMALS))
+    found, address = _REVERSE_MEMO.get(key)
+    if not found:
+        try:
+            address = _reverse_uncached(*key)
+        except requests.RequestException as e:
+            # Not memoized, so a transient failure is retried next time
+            logger.warning("Reverse geocoding error: %s", e)
+            return None
+        _REVERSE_MEMO.put(key, address)
+    return address
+
+
+def _reverse_uncached(lat: float, lon: float) -> Optional[str]:
+    """
+    Reverse geocode rounded coordinates, checking the SQLite cache first.
+
+    Network errors are raised rather than returned so the caller never
+    memoizes a transient failure.
+    """
     cache_key = _get_cache_key("reverse", lat, lon)
     cached = db.get_cache(cache_key)
+    if cached == _FAILED_LOOKUP:
+        # Raise so the recent failure isn't memoized past its short TTL
+        raise requests.RequestException("recent lookup failed, not retrying yet")
     if cached:
         return cached if cached != "null" else None
 
-    _rate_limit()
-
     try:
-        response = requests.get(
-            f"{NOMINATIM_BASE_URL}/reverse",
-            params={
-                "lat": lat,
-                "lon": lon,
-                "format": "json",
-            },
-            headers={"User-Agent": NOMINATIM_USER_AGENT},
-            timeout=10,
-        )
-        response.raise_for_status()
-        result = response.json()
-
-        address = result.get("display_name")
-        db.set_cache(cache_key, address if address else "null", CACHE_TTL_DAYS)
-        return address
+        result = _nominatim_get(_REVERSE_URL, params={"lat": lat, "lon": lon, "format": "json"})
+    except requests.RequestException:
+        db.set_cache(cache_key, _FAILED_LOOKUP, NEGATIVE_CACHE_TTL_DAYS)
+        raise
 
-    except requests.RequestException as e:
-        print(f"Reverse geocoding error: {e}")
-        return None
+    address = result.get("display_name")
+    db.set_cache(cache_key, address if address else "null", CACHE_TTL_DAYS)
+    return address
 
 
 def save_place_from_search_result(result: PlaceSearchResult, name: Optional[str] = None) -> Place:
@@ -472,37 +782,7 @@ def detect_input_type(text: str) -> str:
     Returns:
         'address' if likely a full address, 'name' if likely a place name
     """
-    # Split into words for word-boundary matching
-    words = text.lower().split()
-
-    # Street type abbreviations (must be whole words)
-    street_types = {
-        "street", "st", "st.", "avenue", "ave", "ave.", "road", "rd", "rd.",
-        "drive", "dr", "dr.", "lane", "ln", "ln.", "boulevard", "blvd", "blvd.",
-        "way", "court", "ct", "ct.", "highway", "hwy", "hwy.", "parkway", "pkwy"
-    }
-
-    # Indicators of a full address
-    address_indicators = [
-        # Contains numbers that look like street addresses (first word is a number)
-        any(c.isdigit() for c in text.split()[0]) if text.split() else False,
-        # Contains common address words as whole words
-        any(word in street_types for word in words),
-        # Contains zip code pattern
-        any(len(word) == 5 and word.isdigit() for word in text.split()),
-        # Contains state abbreviation
-        any(word.upper() in [
-            "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-            "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-            "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-            "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-            "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
-        ] for word in text.split()),
-    ]
-
-    if any(address_indicators):
-        return "address"
-    return "name"
+    return "address" if _ADDRESS_RE.search(text) else "name"
 
 
 def smart_search(
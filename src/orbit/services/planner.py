@@ -1,18 +1,30 @@
 """Planner service - optimal daily schedule generation."""
 
-import json
+import bisect
+import heapq
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
-from uuid import UUID, uuid4
 
 from orbit import db
-from orbit.models import FixedBlock, OverflowTask, Plan, PlanItem, Settings, Task
+from orbit.models import (
+    FixedBlock,
+    OverflowTask,
+    Plan,
+    PlanItem,
+    RouteResult,
+    Settings,
+    Task,
+)
 from orbit.services import routing, tasks as tasks_service
+from orbit.utils.jsonio import json_dumps
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeWindow:
     """A time window for scheduling."""
     start: datetime
@@ -36,7 +48,7 @@ class TimeWindow:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledItem:
     """An item scheduled in the plan."""
     type: str  # travel, task, fixed, break
@@ -52,7 +64,7 @@ class ScheduledItem:
     lon: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanResult:
     """Result of plan generation."""
     plan: Plan
@@ -68,8 +80,11 @@ class PlanResult:
     overtime_minutes: float = 0.0
     buffer_minutes: float = 0.0
     suggestions: list[str] = field(default_factory=list)
+    # Whether the plan includes a return-home travel segment
+    ends_at_home: bool = False
 
 
+@lru_cache(maxsize=256)
 def parse_time(time_str: str) -> time:
     """Parse a time string like '09:00' to time object."""
     parts = time_str.split(":")
@@ -78,7 +93,7 @@ def parse_time(time_str: str) -> time:
 
 def combine_date_time(d: date, t: time) -> datetime:
     """Combine date and time into datetime."""
-    return datetime(d.year, d.month, d.day, t.hour, t.minute)
+    return datetime.combine(d, t)
 
 
 def get_task_feasible_window(
@@ -104,19 +119,34 @@ def get_task_feasible_window(
     Returns:
         TimeWindow if feasible, None if no valid window
     """
+    return _feasible_window(
+        task,
+        plan_date,
+        datetime.combine(plan_date, work_start),
+        datetime.combine(plan_date, work_end),
+    )
+
+
+def _feasible_window(
+    task: Task,
+    plan_date: date,
+    day_start: datetime,
+    day_end: datetime,
+) -> Optional[TimeWindow]:
+    """get_task_feasible_window with the working day already combined."""
     # Start with working hours
-    window_start = combine_date_time(plan_date, work_start)
-    window_end = combine_date_time(plan_date, work_end)
+    window_start = day_start
+    window_end = day_end
 
     # Apply place open/close times
     if task.open_time_local:
         open_time = parse_time(task.open_time_local)
-        open_dt = combine_date_time(plan_date, open_time)
+        open_dt = datetime.combine(plan_date, open_time)
         window_start = max(window_start, open_dt)
 
     if task.close_time_local:
         close_time = parse_time(task.close_time_local)
-        close_dt = combine_date_time(plan_date, close_time)
+        close_dt = datetime.combine(plan_date, close_time)
         # Need to finish task before closing
         window_end = min(window_end, close_dt)
 
@@ -158,7 +188,7 @@ def get_free_windows(
         return [TimeWindow(start=day_start, end=day_end)]
 
     # Sort blocks by start time
-    blocks = sorted(fixed_blocks, key=lambda b: b.start_dt)
+    blocks = sorted(fixed_blocks, key=attrgetter("start_dt"))
 
     windows = []
     current_start = day_start
@@ -176,6 +206,147 @@ def get_free_windows(
     return windows
 
 
+# Sort key for tasks without a due date: after every real date
+_NO_DUE_ORDINAL = date.max.toordinal()
+
+# Planner clock: integer microseconds since the start of the working day.
+# Exact for anything a timedelta can hold, and cheaper than datetime math
+_TICK = timedelta(microseconds=1)
+
+
+def _to_ticks(dt: datetime, origin: datetime) -> int:
+    """Convert a datetime to ticks relative to origin."""
+    return (dt - origin) // _TICK
+
+
+def _from_ticks(ticks: int, origin: datetime) -> datetime:
+    """Convert ticks relative to origin back to a datetime."""
+    return origin + timedelta(microseconds=ticks)
+
+
+def _minutes_to_ticks(minutes: float) -> int:
+    """Convert a duration in minutes to ticks, rounding like timedelta."""
+    return timedelta(minutes=minutes) // _TICK
+
+
+class _BusyIntervals:
+    """
+    Busy time kept as sorted, non-overlapping intervals.
+
+    Overlapping intervals are merged on insert, so ends stay sorted along
+    with starts and an overlap query only has to look at the last interval
+    starting before the query's end.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+
+    def add(self, start: int, end: int) -> None:
+        """Insert an interval, merging it with any intervals it overlaps."""
+        lo = bisect.bisect_right(self.ends, start)
+        hi = bisect.bisect_left(self.starts, end)
+        if lo >= hi:
+            self.starts.insert(lo, start)
+            self.ends.insert(lo, end)
+            return
+        self.starts[lo:hi] = [min(start, self.starts[lo])]
+        self.ends[lo:hi] = [max(end, self.ends[hi - 1])]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether [start, end) overlaps any busy interval."""
+        idx = bisect.bisect_left(self.starts, end) - 1
+        return idx >= 0 and self.ends[idx] > start
+
+
+class _FallbackRoute(Exception):
+    """Carries a haversine estimate out of _cached_route so it isn't memoized."""
+
+    def __init__(self, route: RouteResult):
+        super().__init__(route)
+        self.route = route
+
+
+@lru_cache(maxsize=4096)
+def _cached_route(lat1: float, lon1: float, lat2: float, lon2: float) -> RouteResult:
+    """Memoized routing.get_route for the planner's repeated leg lookups."""
+    route = routing.get_route(lat1, lon1, lat2, lon2)
+    if route.source == "fallback":
+        raise _FallbackRoute(route)
+    return route
+
+
+def _route_leg(lat1: float, lon1: float, lat2: float, lon2: float) -> RouteResult:
+    """
+    Route one leg through _cached_route, keyed to 5 decimals (about a metre).
+
+    Haversine fallbacks are returned but not memoized, so a later plan can
+    pick up the real route once OSRM answers again.
+    """
+    try:
+        return _cached_route(
+            round(lat1, 5), round(lon1, 5), round(lat2, 5), round(lon2, 5)
+        )
+    except _FallbackRoute as fallback:
+        return fallback.route
+
+
+def _travel_matrices(
+    stops: list[tuple[float, float]],
+) -> tuple[list[list[float]], list[list[float]]]:
+    """
+    Build travel time and distance matrices between planner stops.
+
+    Stops at the same spot (coordinates equal to 5 decimals, about a
+    metre) share their legs. Legs come from the route cache, then from one
+    OSRM table request for the missing ones (routing.get_leg_routes); any
+    left after that are routed on their own.
+
+    Args:
+        stops: (lat, lon) of each stop
+
+    Returns:
+        Tuple of (duration_matrix_minutes, distance_matrix_km), indexed by stop
+    """
+    spot_ids: dict[tuple[float, float], int] = {}
+    spots: list[tuple[float, float]] = []
+    stop_spots: list[int] = []
+    for lat, lon in stops:
+        key = (round(lat, 5), round(lon, 5))
+        if key not in spot_ids:
+            spot_ids[key] = len(spots)
+            spots.append((lat, lon))
+        stop_spots.append(spot_ids[key])
+
+    n = len(stops)
+    legs = list(dict.fromkeys(
+        (stop_spots[i], stop_spots[j])
+        for i in range(n)
+        for j in range(n)
+        if i != j
+    ))
+
+    leg_values, missing = routing.get_leg_routes(spots, legs)
+    if missing:
+        # Legs are independent network lookups, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            routes = executor.map(
+                lambda leg: _route_leg(*spots[leg[0]], *spots[leg[1]]), missing
+            )
+            for leg, route in zip(missing, routes):
+                leg_values[leg] = (route.duration_minutes, route.distance_km)
+
+    minutes = [[0.0] * n for _ in range(n)]
+    km = [[0.0] * n for _ in range(n)]
+    for i, from_spot in enumerate(stop_spots):
+        for j, to_spot in enumerate(stop_spots):
+            if i != j:
+                minutes[i][j], km[i][j] = leg_values[(from_spot, to_spot)]
+    return minutes, km
+
+
 def calculate_priority_score(task: Task, plan_date: date) -> float:
     """
     Calculate a priority score for task ordering.
@@ -204,6 +375,201 @@ def calculate_priority_score(task: Task, plan_date: date) -> float:
     return score
 
 
+def _select_best(
+    remaining: list[int],
+    travel_minutes: list[float],
+    travel_ticks: list[int],
+    window_starts: list[int],
+    window_ends: list[int],
+    durations: list[int],
+    priority_scores: list[float],
+    current_time: int,
+    day_end: int,
+    busy: _BusyIntervals,
+) -> tuple[int, int]:
+    """
+    Pick the next errand for the greedy planner.
+
+    Scores every remaining candidate that can be reached, started and
+    finished inside its window and the working day without hitting busy
+    time. Ties keep the earliest candidate. All times are ticks.
+
+    Args:
+        remaining: Indexes of candidates still worth trying, in order
+        travel_minutes, travel_ticks: Travel time from the current stop,
+            indexed by stop (home is 0, candidate j is j + 1)
+        window_starts, window_ends, durations, priority_scores:
+            Per-candidate columns
+        current_time: Time we leave the current stop
+        day_end: End of the working day
+        busy: Busy intervals so far
+
+    Returns:
+        Tuple of (candidate index or -1, arrival time)
+    """
+    best_idx = -1
+    best_score = float("-inf")
+    best_arrival_time = current_time
+
+    for j in remaining:
+        # Calculate arrival time from current location
+        arrival_time = current_time + travel_ticks[j + 1]
+
+        # Check if we can start within the window
+        window_end = window_ends[j]
+        if arrival_time > window_end:
+            continue  # Can't make it in time
+
+        # Wait if we arrive early
+        actual_start = max(arrival_time, window_starts[j])
+
+        # Check if we can finish within the window and day
+        task_end = actual_start + durations[j]
+        if task_end > window_end:
+            continue  # Task won't fit
+        if task_end > day_end:
+            continue  # Past work hours
+
+        # Calculate score: minimize travel, prioritize by due date/priority
+        # Negative travel time so lower travel = higher score
+        score = priority_scores[j] - travel_minutes[j + 1] * 2
+        if score <= best_score:
+            continue  # Can't beat the best so far; skip the busy lookup
+
+        # Check for conflicts with fixed blocks and scheduled items
+        if busy.overlaps(actual_start, task_end):
+            continue
+
+        best_score = score
+        best_idx = j
+        best_arrival_time = arrival_time
+
+    return best_idx, best_arrival_time
+
+
+def _route_times(
+    route: list[int],
+    ticks_matrix: list[list[int]],
+    window_starts: list[int],
+    window_ends: list[int],
+    durations: list[int],
+    day_end: int,
+    busy: _BusyIntervals,
+) -> Optional[list[tuple[int, int, int]]]:
+    """
+    Time a fixed visiting order of errands, leaving home at tick 0.
+
+    Args:
+        route: Candidate indexes in visiting order
+        ticks_matrix: Travel ticks between stops (home is 0, candidate j
+            is j + 1)
+        window_starts, window_ends, durations: Per-candidate columns
+        day_end: End of the working day
+        busy: Busy intervals the errands must avoid
+
+    Returns:
+        (arrival, start, end) ticks per errand, or None if any errand
+        misses its window, the working day, or runs into busy time
+    """
+    times = []
+    current_time = 0
+    current_stop = 0
+    for j in route:
+        arrival_time = current_time + ticks_matrix[current_stop][j + 1]
+        actual_start = max(arrival_time, window_starts[j])
+        task_end = actual_start + durations[j]
+        if task_end > window_ends[j] or task_end > day_end:
+            return None
+        if busy.overlaps(actual_start, task_end):
+            return None
+        times.append((arrival_time, actual_start, task_end))
+        current_time = task_end
+        current_stop = j + 1
+    return times
+
+
+def _two_opt(
+    route: list[int],
+    minutes_matrix: list[list[float]],
+    ticks_matrix: list[list[int]],
+    window_starts: list[int],
+    window_ends: list[int],
+    durations: list[int],
+    day_end: int,
+    busy: _BusyIntervals,
+    return_home: bool,
+) -> list[int]:
+    """
+    Improve an errand order with 2-opt moves.
+
+    Reverses any stretch of the route that cuts total travel time while
+    every errand still fits and the run finishes no later, until no such
+    stretch is left. Finishing no later keeps at least as much free time
+    for home tasks, so less driving never costs a scheduled task. The
+    greedy order is already feasible, so the result always is too.
+
+    Args:
+        route: Feasible candidate indexes in visiting order
+        minutes_matrix: Travel minutes between stops
+        ticks_matrix, window_starts, window_ends, durations, day_end, busy:
+            As for _route_times
+        return_home: Whether the drive back home counts toward travel
+
+    Returns:
+        The improved visiting order
+    """
+    def finish(order: list[int]) -> Optional[int]:
+        times = _route_times(
+            order, ticks_matrix, window_starts, window_ends, durations, day_end, busy
+        )
+        if times is None:
+            return None
+        if not times:
+            return 0
+        end = times[-1][2]
+        if return_home:
+            end += ticks_matrix[order[-1] + 1][0]
+        return end
+
+    n = len(route)
+    best_finish = finish(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            before = route[i - 1] + 1 if i else 0
+            first = route[i] + 1
+            # Travel along route[i..k], forwards and reversed, grown one
+            # leg at a time so each move is priced from the edges it changes
+            forward = reverse = 0.0
+            for k in range(i + 1, n):
+                prev_stop, last = route[k - 1] + 1, route[k] + 1
+                forward += minutes_matrix[prev_stop][last]
+                reverse += minutes_matrix[last][prev_stop]
+                old_travel = minutes_matrix[before][first] + forward
+                new_travel = minutes_matrix[before][last] + reverse
+                if k + 1 < n or return_home:
+                    after = route[k + 1] + 1 if k + 1 < n else 0
+                    old_travel += minutes_matrix[last][after]
+                    new_travel += minutes_matrix[first][after]
+                # Small tolerance so float noise can't cycle between orders
+                if new_travel >= old_travel - 1e-9:
+                    continue
+                candidate = route[:i] + route[i:k + 1][::-1] + route[k + 1:]
+                candidate_finish = finish(candidate)
+                if candidate_finish is None or candidate_finish > best_finish:
+                    continue
+                route = candidate
+                best_finish = candidate_finish
+                improved = True
+                break
+            if improved:
+                # The running sums describe the old order, so start over
+                break
+
+    return route
+
+
 def generate_plan(
     plan_date: date,
     settings: Settings,
@@ -216,7 +582,8 @@ def generate_plan(
     1. Starts at home
     2. At each step, chooses the next feasible errand that minimizes travel
     3. Respects time constraints and working hours
-    4. Optionally returns home at the end
+    4. Shortens the chosen errand order with 2-opt moves
+    5. Optionally returns home at the end
 
     Args:
         plan_date: Date to plan for
@@ -233,8 +600,8 @@ def generate_plan(
     # Get work hours
     work_start = parse_time(settings.default_work_start)
     work_end = parse_time(settings.default_work_end)
-    day_start = combine_date_time(plan_date, work_start)
-    day_end = combine_date_time(plan_date, work_end)
+    day_start = datetime.combine(plan_date, work_start)
+    day_end = datetime.combine(plan_date, work_end)
 
     # Get fixed blocks
     fixed_blocks = tasks_service.get_fixed_blocks_for_date(plan_date)
@@ -248,9 +615,11 @@ def generate_plan(
 
     # Initialize result lists
     scheduled: list[ScheduledItem] = []
-    overflow: list[OverflowTask] = []
+    # (task, reason) pairs; OverflowTask models are built once at the end
+    unscheduled: list[tuple[Task, str]] = []
 
     # Add fixed blocks to schedule
+    busy = _BusyIntervals()
     for block in fixed_blocks:
         scheduled.append(ScheduledItem(
             type="fixed",
@@ -258,6 +627,10 @@ def generate_plan(
             end=block.end_dt,
             title=block.title,
         ))
+        busy.add(
+            _to_ticks(block.start_dt, day_start),
+            _to_ticks(block.end_dt, day_start),
+        )
 
     # Current state
     current_time = day_start
@@ -265,101 +638,106 @@ def generate_plan(
     current_lon = settings.home_lon
     current_place = settings.home_name
 
-    # Track which tasks are done
-    scheduled_task_ids: set[UUID] = set()
     total_travel_km = 0.0
     total_travel_minutes = 0.0
 
-    # Calculate feasible windows for all errands
-    errand_windows: dict[UUID, TimeWindow] = {}
+    # Calculate feasible windows for all errands. Errands with a window
+    # become candidates, described by columns aligned by index so the
+    # greedy loop does no dict lookups or datetime arithmetic per candidate
+    candidates: list[Task] = []
+    window_starts: list[int] = []
+    window_ends: list[int] = []
     for task in errand_tasks:
         if not task.has_location:
-            overflow.append(OverflowTask(task=task, reason="Missing location"))
+            unscheduled.append((task, "Missing location"))
             continue
 
-        window = get_task_feasible_window(task, plan_date, work_start, work_end)
+        window = _feasible_window(task, plan_date, day_start, day_end)
         if window:
-            errand_windows[task.id] = window
+            candidates.append(task)
+            window_starts.append(_to_ticks(window.start, day_start))
+            window_ends.append(_to_ticks(window.end, day_start))
         else:
-            overflow.append(OverflowTask(task=task, reason="No feasible time window"))
-
-    # Greedy insertion for errands
-    while True:
-        # Find best next errand
-        best_task: Optional[Task] = None
-        best_score = float("-inf")
-        best_arrival_time: Optional[datetime] = None
-        best_travel_time = 0.0
-        best_travel_km = 0.0
-
-        for task in errand_tasks:
-            if task.id in scheduled_task_ids:
-                continue
-            if task.id not in errand_windows:
-                continue
-
-            window = errand_windows[task.id]
-
-            # Calculate travel time from current location
-            route = routing.get_route(
-                current_lat, current_lon,
-                task.lat, task.lon,
-            )
-            travel_minutes = route.duration_minutes
-
-            # Calculate arrival time
-            arrival_time = current_time + timedelta(minutes=travel_minutes)
-
-            # Check if we can start within the window
-            if arrival_time > window.end:
-                continue  # Can't make it in time
-
-            # Wait if we arrive early
-            actual_start = max(arrival_time, window.start)
-
-            # Check if we can finish within the window and day
-            task_end = actual_start + timedelta(minutes=task.duration_minutes)
-            if task_end > window.end:
-                continue  # Task won't fit
-            if task_end > day_end:
-                continue  # Past work hours
-
-            # Check for conflicts with fixed blocks
-            task_window = TimeWindow(start=actual_start, end=task_end)
-            conflict = False
-            for block in fixed_blocks:
-                block_window = TimeWindow(start=block.start_dt, end=block.end_dt)
-                if task_window.overlaps(block_window):
-                    conflict = True
-                    break
-
-            # Also check against already scheduled items
-            for item in scheduled:
-                item_window = TimeWindow(start=item.start, end=item.end)
-                if task_window.overlaps(item_window):
-                    conflict = True
-                    break
-
-            if conflict:
-                continue
+            unscheduled.append((task, "No feasible time window"))
 
-            # Calculate score: minimize travel, prioritize by due date/priority
-            priority_score = calculate_priority_score(task, plan_date)
-            # Negative travel time so lower travel = higher score
-            score = priority_score - travel_minutes * 2
+    durations = [_minutes_to_ticks(task.duration_minutes) for task in candidates]
+    priority_scores = [calculate_priority_score(task, plan_date) for task in candidates]
 
-            if score > best_score:
-                best_score = score
-                best_task = task
-                best_arrival_time = arrival_time
-                best_travel_time = travel_minutes
-                best_travel_km = route.distance_km
+    # Precompute routes between all stops: index 0 is home, candidate j is
+    # stop j + 1
+    stops = [(settings.home_lat, settings.home_lon)] + [
+        (task.lat, task.lon) for task in candidates
+    ]
+    minutes_matrix, km_matrix = _travel_matrices(stops)
+    ticks_matrix = [
+        [_minutes_to_ticks(minutes) for minutes in row] for row in minutes_matrix
+    ]
+    current_idx = 0
+    current_ticks = 0
+    day_end_ticks = _to_ticks(day_end, day_start)
+    remaining = list(range(len(candidates)))
+    # Which candidates made it into the plan, by index
+    picked = bytearray(len(candidates))
+
+    # Greedy insertion picks the errands and a first visiting order
+    route: list[int] = []
+    while remaining:
+        # Find best next errand
+        best_idx, arrival_ticks = _select_best(
+            remaining,
+            minutes_matrix[current_idx],
+            ticks_matrix[current_idx],
+            window_starts,
+            window_ends,
+            durations,
+            priority_scores,
+            current_ticks,
+            day_end_ticks,
+            busy,
+        )
 
-        if best_task is None:
+        if best_idx < 0:
             break  # No more feasible errands
 
-        window = errand_windows[best_task.id]
-        actual_start = max(best_arrival_time, window.start)
+        end_ticks = max(arrival_ticks, window_starts[best_idx]) + durations[best_idx]
+        route.append(best_idx)
+        picked[best_idx] = 1
+        current_ticks = end_ticks
+        current_idx = best_idx + 1
+
+        # Time only moves forward, so drop errands that can no longer fit
+        # even with zero travel; stop once none are left
+        remaining = [
+            j for j in remaining
+            if j != best_idx
+            and end_ticks + durations[j] <= min(window_ends[j], day_end_ticks)
+        ]
+
+    # Untangle the greedy order, then lay the errands out along it
+    route = _two_opt(
+        route,
+        minutes_matrix,
+        ticks_matrix,
+        window_starts,
+        window_ends,
+        durations,
+        day_end_ticks,
+        busy,
+        return_home,
+    )
+    route_times = _route_times(
+        route, ticks_matrix, window_starts, window_ends, durations, day_end_ticks, busy
+    )
+    current_idx = 0
+    current_ticks = 0
+    for best_idx, (arrival_ticks, start_ticks, end_ticks) in zip(route, route_times):
+        best_task = candidates[best_idx]
+        place_label = best_task.location_name or best_task.address
+        best_travel_time = minutes_matrix[current_idx][best_idx + 1]
+        best_travel_km = km_matrix[current_idx][best_idx + 1]
+        best_arrival_time = _from_ticks(arrival_ticks, day_start)
+        actual_start = _from_ticks(start_ticks, day_start)
+        task_end = _from_ticks(end_ticks, day_start)
 
         # Add travel segment
         if best_travel_time > 0:
@@ -367,19 +745,19 @@ def generate_plan(
                 type="travel",
                 start=current_time,
                 end=best_arrival_time,
-                title=f"Drive to {best_task.location_name or best_task.address}",
+                title=f"Drive to {place_label}",
                 from_place=current_place,
-                to_place=best_task.location_name or best_task.address,
+                to_place=place_label,
                 distance_km=best_travel_km,
                 travel_minutes=int(best_travel_time),
             )
             scheduled.append(travel_item)
+            busy.add(current_ticks, arrival_ticks)
             total_travel_km += best_travel_km
             total_travel_minutes += best_travel_time
 
         # Add wait/break if needed
-        if actual_start > best_arrival_time:
-            wait_minutes = (actual_start - best_arrival_time).total_seconds() / 60
+        if start_ticks > arrival_ticks:
             wait_item = ScheduledItem(
                 type="break",
                 start=best_arrival_time,
@@ -387,9 +765,9 @@ def generate_plan(
                 title=f"Wait for {best_task.location_name or 'location'} to open",
             )
             scheduled.append(wait_item)
+            busy.add(arrival_ticks, start_ticks)
 
         # Add task
-        task_end = actual_start + timedelta(minutes=best_task.duration_minutes)
         task_item = ScheduledItem(
             type="task",
             start=actual_start,
@@ -400,27 +778,29 @@ def generate_plan(
             lon=best_task.lon,
         )
         scheduled.append(task_item)
+        busy.add(start_ticks, end_ticks)
 
         # Update state
         current_time = task_end
+        current_ticks = end_ticks
         current_lat = best_task.lat
         current_lon = best_task.lon
-        current_place = best_task.location_name or best_task.address
-        scheduled_task_ids.add(best_task.id)
+        current_place = place_label
+        current_idx = best_idx + 1
 
     # Mark remaining errands as overflow
-    for task in errand_tasks:
-        if task.id not in scheduled_task_ids and task.id in errand_windows:
-            overflow.append(OverflowTask(task=task, reason="Insufficient time in schedule"))
+    for task, was_picked in zip(candidates, picked):
+        if not was_picked:
+            unscheduled.append((task, "Insufficient time in schedule"))
 
     # Return home if requested
+    ends_at_home = False
     if return_home and (current_lat != settings.home_lat or current_lon != settings.home_lon):
-        if current_time < day_end:
-            route = routing.get_route(
-                current_lat, current_lon,
-                settings.home_lat, settings.home_lon,
-            )
-            travel_end = current_time + timedelta(minutes=route.duration_minutes)
+        if current_ticks < day_end_ticks:
+            home_minutes = minutes_matrix[current_idx][0]
+            home_km = km_matrix[current_idx][0]
+            travel_end_ticks = current_ticks + ticks_matrix[current_idx][0]
+            travel_end = _from_ticks(travel_end_ticks, day_start)
 
             travel_item = ScheduledItem(
                 type="travel",
@@ -429,97 +809,102 @@ def generate_plan(
                 title=f"Return to {settings.home_name}",
                 from_place=current_place,
                 to_place=settings.home_name,
-                distance_km=route.distance_km,
-                travel_minutes=int(route.duration_minutes),
+                distance_km=home_km,
+                travel_minutes=int(home_minutes),
             )
             scheduled.append(travel_item)
-            total_travel_km += route.distance_km
-            total_travel_minutes += route.duration_minutes
+            busy.add(current_ticks, travel_end_ticks)
+            total_travel_km += home_km
+            total_travel_minutes += home_minutes
             current_time = travel_end
+            current_ticks = travel_end_ticks
+            ends_at_home = True
 
     # Schedule home tasks in remaining gaps
-    # Find free windows
-    scheduled_windows = [TimeWindow(start=s.start, end=s.end) for s in scheduled]
-    all_busy = sorted(scheduled_windows, key=lambda w: w.start)
-
-    # Merge overlapping windows
-    merged_busy = []
-    for w in all_busy:
-        if merged_busy and w.start <= merged_busy[-1].end:
-            merged_busy[-1] = TimeWindow(
-                start=merged_busy[-1].start,
-                end=max(merged_busy[-1].end, w.end)
-            )
-        else:
-            merged_busy.append(w)
-
-    # Find gaps
-    free_gaps = []
-    gap_start = day_start
-    for busy in merged_busy:
-        if gap_start < busy.start:
-            free_gaps.append(TimeWindow(start=gap_start, end=busy.start))
-        gap_start = max(gap_start, busy.end)
-    if gap_start < day_end:
-        free_gaps.append(TimeWindow(start=gap_start, end=day_end))
+    # Busy intervals are already sorted and merged, so one sweep finds the
+    # gaps as (start, end) tick pairs; in start order they already form a
+    # min-heap keyed on start
+    free_gaps: list[tuple[int, int]] = []
+    gap_start = 0
+    for busy_start, busy_end in zip(busy.starts, busy.ends):
+        if gap_start < busy_start:
+            free_gaps.append((gap_start, busy_start))
+        gap_start = max(gap_start, busy_end)
+    if gap_start < day_end_ticks:
+        free_gaps.append((gap_start, day_end_ticks))
 
     # Schedule home tasks (earliest deadline first)
     home_tasks_sorted = sorted(
         home_tasks,
-        key=lambda t: (t.due_date or date.max, -t.priority)
+        key=lambda t: (
+            t.due_date.toordinal() if t.due_date else _NO_DUE_ORDINAL,
+            -t.priority,
+        ),
     )
 
     for task in home_tasks_sorted:
-        # Find a gap that fits
-        for gap in free_gaps:
-            if gap.duration_minutes >= task.duration_minutes:
-                task_start = gap.start
-                task_end = task_start + timedelta(minutes=task.duration_minutes)
-
-                task_item = ScheduledItem(
-                    type="task",
-                    start=task_start,
-                    end=task_end,
-                    title=task.title,
-                    task=task,
-                    lat=settings.home_lat,
-                    lon=settings.home_lon,
-                )
-                scheduled.append(task_item)
-                scheduled_task_ids.add(task.id)
-
-                # Update gap
-                if task_end < gap.end:
-                    gap.start = task_end
-                else:
-                    free_gaps.remove(gap)
-                break
-        else:
-            # No gap found
-            if task.id not in scheduled_task_ids:
-                overflow.append(OverflowTask(task=task, reason="No free time slot available"))
+        duration = _minutes_to_ticks(task.duration_minutes)
+
+        # Take the earliest gap that fits, setting smaller ones aside
+        too_small = []
+        placed = False
+        while free_gaps:
+            gap_start, gap_end = heapq.heappop(free_gaps)
+            if gap_end - gap_start < duration:
+                too_small.append((gap_start, gap_end))
+                continue
+
+            task_end_ticks = gap_start + duration
+            task_item = ScheduledItem(
+                type="task",
+                start=_from_ticks(gap_start, day_start),
+                end=_from_ticks(task_end_ticks, day_start),
+                title=task.title,
+                task=task,
+                lat=settings.home_lat,
+                lon=settings.home_lon,
+            )
+            scheduled.append(task_item)
+            placed = True
+
+            # Return the rest of the gap
+            if task_end_ticks < gap_end:
+                heapq.heappush(free_gaps, (task_end_ticks, gap_end))
+            break
+
+        for gap in too_small:
+            heapq.heappush(free_gaps, gap)
+
+        # No gap found
+        if not placed:
+            unscheduled.append((task, "No free time slot available"))
 
-    # Sort scheduled items by start time
-    scheduled.sort(key=lambda s: s.start)
+    # Types are already known here, so skip per-item model validation
+    overflow = [
+        OverflowTask.model_construct(task=task, reason=reason)
+        for task, reason in unscheduled
+    ]
+
+    # Sort scheduled items by start time. The errand chain is appended in
+    # time order, so the list is mostly sorted runs that timsort merges in
+    # near-linear time; one stable sort is cheaper than insort per append
+    scheduled.sort(key=attrgetter("start"))
 
     # Create plan and plan items
+    assumptions = {
+        "work_start": settings.default_work_start,
+        "work_end": settings.default_work_end,
+        "return_home": return_home,
+        "home_address": settings.home_address,
+    }
     plan = Plan(
         plan_date=plan_date,
-        assumptions_json=json.dumps({
-            "work_start": settings.default_work_start,
-            "work_end": settings.default_work_end,
-            "return_home": return_home,
-            "home_address": settings.home_address,
-        }),
+        assumptions_json=json_dumps(assumptions),
     )
-    db.save_plan(plan)
 
-    # Delete old plan items
-    db.delete_plan_items(plan.id)
-
-    # Save plan items
-    for idx, item in enumerate(scheduled):
-        plan_item = PlanItem(
+    # Save the plan and its items together
+    db.replace_plan(plan, [
+        PlanItem(
             plan_id=plan.id,
             order_index=idx,
             start_dt=item.start,
@@ -534,7 +919,8 @@ def generate_plan(
             lat=item.lat,
             lon=item.lon,
         )
-        db.save_plan_item(plan_item)
+        for idx, item in enumerate(scheduled)
+    ])
 
     # Calculate time window validation
     schedule_end_time = None
@@ -573,9 +959,37 @@ def generate_plan(
         overtime_minutes=round(overtime_minutes, 1),
         buffer_minutes=round(buffer_minutes, 1),
         suggestions=suggestions,
+        ends_at_home=ends_at_home,
     )
 
 
+def generate_plans_batch(
+    plan_dates: list[date],
+    settings: Settings,
+    return_home: bool = True,
+) -> list[PlanResult]:
+    """
+    Generate plans for several dates, e.g. a week view.
+
+    Plans for different dates share no state besides their own database
+    rows, so they are generated concurrently. Most of the time goes to
+    routing lookups, which threads overlap well.
+
+    Args:
+        plan_dates: Dates to plan for
+        settings: User settings
+        return_home: Whether to return home at end
+
+    Returns:
+        PlanResults in the same order as plan_dates
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(
+            lambda plan_date: generate_plan(plan_date, settings, return_home),
+            plan_dates,
+        ))
+
+
 def generate_suggestions(
     scheduled: list[ScheduledItem],
     overflow: list[OverflowTask],
@@ -607,20 +1021,22 @@ def generate_suggestions(
         )
 
     # Suggestion 3: Drop lowest priority task
-    scheduled_tasks = [
-        item for item in scheduled
+    # Positions of scheduled tasks, so neighbours are found without
+    # searching the list for each one
+    task_positions = [
+        idx for idx, item in enumerate(scheduled)
         if item.type == "task" and item.task is not None
     ]
+    scheduled_tasks = [scheduled[idx] for idx in task_positions]
 
     if scheduled_tasks:
         # Calculate time savings for each task
         task_savings = []
-        for item in scheduled_tasks:
+        for item_idx, item in zip(task_positions, scheduled_tasks):
             # Time saved = task duration + associated travel
             time_saved = item.task.duration_minutes
 
             # Find adjacent travel segments
-            item_idx = scheduled.index(item)
             if item_idx > 0 and scheduled[item_idx - 1].type == "travel":
                 time_saved += scheduled[item_idx - 1].travel_minutes or 0
             if item_idx < len(scheduled) - 1 and scheduled[item_idx + 1].type == "travel":
@@ -690,21 +1106,16 @@ def get_route_waypoints(
     Returns:
         List of (lat, lon, name) tuples
     """
-    waypoints = [(settings.home_lat, settings.home_lon, settings.home_name)]
-
-    for item in plan_result.items:
-        if item.type == "task" and item.lat and item.lon:
-            name = item.task.location_name if item.task else item.title
-            waypoints.append((item.lat, item.lon, name))
-
-    # Check if ends at home
-    if len(waypoints) > 1:
-        last = waypoints[-1]
-        if last[0] != settings.home_lat or last[1] != settings.home_lon:
-            # Add return to home if there's a return travel segment
-            for item in plan_result.items:
-                if item.type == "travel" and item.to_place == settings.home_name:
-                    waypoints.append((settings.home_lat, settings.home_lon, settings.home_name))
-                    break
+    home = (settings.home_lat, settings.home_lon, settings.home_name)
+    waypoints = [home] + [
+        (item.lat, item.lon, item.task.location_name if item.task else item.title)
+        for item in plan_result.items
+        if item.type == "task" and item.lat and item.lon
+    ]
+
+    # Close the loop if the plan drives back home from somewhere else
+    last = waypoints[-1]
+    if plan_result.ends_at_home and (last[0] != home[0] or last[1] != home[1]):
+        waypoints.append(home)
 
     return waypoints
@@ -1,17 +1,31 @@
 """Prep notes service - suggest what to bring based on errand purpose."""
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from typing import Optional
 
+# pyahocorasick is optional (the "fast" extra); fall back to a compiled regex without it
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PrepNote:
     """Preparation notes for an errand."""
-    documents: list[str]  # Required documents
-    items: list[str]  # Items to bring
-    tips: list[str]  # Helpful tips
+    documents: tuple[str, ...]  # Required documents
+    items: tuple[str, ...]  # Items to bring
+    tips: tuple[str, ...]  # Helpful tips
     crowdedness_hint: Optional[str] = None  # e.g., "Usually busy at lunchtime"
 
+    def __post_init__(self):
+        # Accept lists too, but store tuples so notes stay hashable
+        for name in ("documents", "items", "tips"):
+            object.__setattr__(self, name, tuple(getattr(self, name)))
+
 
 # Rule-based suggestions keyed by keywords in purpose
 PURPOSE_RULES = {
@@ -191,10 +205,63 @@ PURPOSE_RULES = {
 }
 
 
+# Rules ordered longest keyword first (longer = more specific = higher
+# priority), as (keyword, documents, items, tips, crowdedness) tuples;
+# sorted and normalized once here instead of on every lookup
+_RULES_SORTED = tuple(
+    (
+        keyword,
+        tuple(rules.get("documents", ())),
+        tuple(rules.get("items", ())),
+        tuple(rules.get("tips", ())),
+        rules.get("crowdedness"),
+    )
+    for keyword, rules in sorted(
+        PURPOSE_RULES.items(), key=lambda kv: len(kv[0]), reverse=True
+    )
+)
+
+# Position of each keyword's rule in _RULES_SORTED
+_RULE_RANK = {rule[0]: rank for rank, rule in enumerate(_RULES_SORTED)}
+
+
+def _build_keyword_automaton():
+    """Compile the PURPOSE_RULES keywords into one Aho-Corasick automaton."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in PURPOSE_RULES:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Fallback matcher: one regex alternation, longest keyword first. The
+# lookahead tries every position, so overlapping keywords are all found,
+# just as with substring checks (no keyword is a prefix of another)
+_KEYWORD_RE = re.compile(
+    "(?=({}))".format(
+        "|".join(map(re.escape, sorted(PURPOSE_RULES, key=len, reverse=True)))
+    )
+)
+
+
+def _matched_keywords(text: str) -> set[str]:
+    """Find every PURPOSE_RULES keyword that occurs in text."""
+    if _KEYWORD_AUTOMATON is not None:
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(text)}
+    return set(_KEYWORD_RE.findall(text))
+
+
+@lru_cache(maxsize=512)
 def get_prep_notes(purpose: str, place_name: str = "") -> PrepNote:
     """
     Generate prep notes based on errand purpose and place.
 
+    Results are memoized; PrepNote is frozen so cached notes can be shared.
+
     Args:
         purpose: Description of what user is doing (e.g., "license renewal")
         place_name: Name of the place (e.g., "DMV", "Target")
@@ -202,53 +269,28 @@ def get_prep_notes(purpose: str, place_name: str = "") -> PrepNote:
     Returns:
         PrepNote with suggestions
     """
-    purpose_lower = purpose.lower() if purpose else ""
-    place_lower = place_name.lower() if place_name else ""
-
-    # Combine for matching
-    combined = f"{purpose_lower} {place_lower}"
-
-    documents = []
-    items = []
-    tips = []
-    crowdedness = None
-
-    # Find matching rules (can match multiple)
-    matched_rules = []
-    for keyword, rules in PURPOSE_RULES.items():
-        if keyword in combined:
-            matched_rules.append((keyword, rules))
-
-    # Sort by keyword length (longer = more specific = higher priority)
-    matched_rules.sort(key=lambda x: len(x[0]), reverse=True)
-
-    # Aggregate from all matching rules (deduplicating)
-    seen_docs = set()
-    seen_items = set()
-    seen_tips = set()
-
-    for _, rules in matched_rules:
-        for doc in rules.get("documents", []):
-            if doc not in seen_docs:
-                documents.append(doc)
-                seen_docs.add(doc)
-        for item in rules.get("items", []):
-            if item not in seen_items:
-                items.append(item)
-                seen_items.add(item)
-        for tip in rules.get("tips", []):
-            if tip not in seen_tips:
-                tips.append(tip)
-                seen_tips.add(tip)
-        if not crowdedness and rules.get("crowdedness"):
-            crowdedness = rules["crowdedness"]
+    # Combine for matching, lowercasing both halves in one call
+    combined = f"{purpose or ''} {place_name or ''}".lower()
+
+    # Find matching rules (can match multiple) in one scan of the text
+    matched = _matched_keywords(combined)
+    matched_rules = [
+        _RULES_SORTED[rank] for rank in sorted(_RULE_RANK[k] for k in matched)
+    ]
+
+    # Aggregate from all matching rules, most specific first; dict keys
+    # keep first-seen order, which deduplicates in the same pass
+    documents = tuple(dict.fromkeys(chain.from_iterable(rule[1] for rule in matched_rules)))
+    items = tuple(dict.fromkeys(chain.from_iterable(rule[2] for rule in matched_rules)))
+    tips = tuple(dict.fromkeys(chain.from_iterable(rule[3] for rule in matched_rules)))
+    crowdedness = next((rule[4] for rule in matched_rules if rule[4]), None)
 
     # If nothing matched, use generic errand
     if not documents and not items and not tips:
         default = PURPOSE_RULES.get("errand", {})
-        documents = default.get("documents", [])
-        items = default.get("items", [])
-        tips = default.get("tips", [])
+        documents = tuple(default.get("documents", ()))
+        items = tuple(default.get("items", ()))
+        tips = tuple(default.get("tips", ()))
 
     return PrepNote(
         documents=documents,
@@ -258,29 +300,25 @@ def get_prep_notes(purpose: str, place_name: str = "") -> PrepNote:
     )
 
 
+@lru_cache(maxsize=512)
 def format_prep_notes(prep: PrepNote) -> str:
-    """Format prep notes as markdown string."""
-    lines = []
+    """Format prep notes as markdown string (memoized per note)."""
+    sections = []
 
     if prep.documents:
-        lines.append("**Documents to bring:**")
-        for doc in prep.documents:
-            lines.append(f"- {doc}")
-        lines.append("")
+        sections.append(
+            "**Documents to bring:**\n" + "\n".join(f"- {doc}" for doc in prep.documents)
+        )
 
     if prep.items:
-        lines.append("**Items to bring:**")
-        for item in prep.items:
-            lines.append(f"- {item}")
-        lines.append("")
+        sections.append(
+            "**Items to bring:**\n" + "\n".join(f"- {item}" for item in prep.items)
+        )
 
     if prep.tips:
-        lines.append("**Tips:**")
-        for tip in prep.tips:
-            lines.append(f"- {tip}")
-        lines.append("")
+        sections.append("**Tips:**\n" + "\n".join(f"- {tip}" for tip in prep.tips))
 
     if prep.crowdedness_hint:
-        lines.append(f"**Crowdedness:** {prep.crowdedness_hint}")
+        sections.append(f"**Crowdedness:** {prep.crowdedness_hint}")
 
-    return "\n".join(lines) if lines else "No specific preparation needed."
+    return "\n\n".join(sections) if sections else "No specific preparation needed."
@@ -1,16 +1,19 @@
 """Place resolver service - fuzzy matching, scoring, and disambiguation."""
 
+import logging
 import re
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from rapidfuzz import fuzz, process
 
 from orbit.models import Settings, PlaceSearchResult
 from orbit.services import places, routing
-from orbit.config import OSM_SEARCH_RADIUS_MILES, OSM_EXPANDED_RADIUS_MILES
+from orbit.config import CACHE_TTL_DAYS, OSM_SEARCH_RADIUS_MILES, OSM_EXPANDED_RADIUS_MILES
 
 # Import LLM and web search services (optional)
 try:
@@ -38,6 +41,8 @@ try:
 except ImportError:
     TAVILY_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 
 class ResolutionDecision(Enum):
     """How a place was resolved."""
@@ -122,6 +127,11 @@ class ResolvedPlace:
         return self.decision in (ResolutionDecision.AUTO_BEST, ResolutionDecision.USER_SELECTED)
 
 
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
     """
     Normalize text for fuzzy matching.
@@ -132,17 +142,33 @@ def normalize_text(text: str) -> str:
     """
     text = text.lower()
     # Remove punctuation except spaces
-    text = re.sub(r'[^\w\s]', '', text)
+    text = _PUNCT_RE.sub('', text)
     # Collapse whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     return text
 
 
-def calculate_name_similarity(query: str, candidate_name: str) -> float:
+# Fuzzy strategies for name similarity; the best of them wins. The usual
+# winners go first so the others can be cut off early
+_NAME_SCORERS = (
+    fuzz.token_set_ratio,   # Token set comparison
+    fuzz.partial_ratio,     # Partial/substring match
+    fuzz.ratio,             # Full string match
+    fuzz.token_sort_ratio,  # Token order independent
+)
+
+
+def calculate_name_similarity(
+    query: str,
+    candidate_name: str,
+    score_cutoff: float = 0.0,
+) -> float:
     """
     Calculate fuzzy similarity between query and candidate name.
 
     Uses multiple fuzzy matching strategies and returns best score (0-100).
+    Scores below score_cutoff come back as 0, so callers that only need a
+    threshold test can let rapidfuzz stop early.
     """
     query_norm = normalize_text(query)
     name_norm = normalize_text(candidate_name)
@@ -150,20 +176,95 @@ def calculate_name_similarity(query: str, candidate_name: str) -> float:
     if not query_norm or not name_norm:
         return 0.0
 
-    # Try multiple fuzzy strategies
-    scores = [
-        fuzz.ratio(query_norm, name_norm),           # Full string match
-        fuzz.partial_ratio(query_norm, name_norm),   # Partial/substring match
-        fuzz.token_sort_ratio(query_norm, name_norm), # Token order independent
-        fuzz.token_set_ratio(query_norm, name_norm),  # Token set comparison
-    ]
+    # Each strategy only has to beat the best so far, so pass that as the
+    # cutoff and let rapidfuzz give up early on comparisons that can't
+    best = 0.0
+    for scorer in _NAME_SCORERS:
+        best = max(best, scorer(query_norm, name_norm, score_cutoff=max(best, score_cutoff)))
+        if best >= 100:
+            break
+    return best
+
+
+def calculate_name_similarities(query: str, candidate_names: list[str]) -> list[float]:
+    """
+    Calculate name similarity between a query and many candidate names.
+
+    Same scores as calling calculate_name_similarity for each name, but
+    each fuzzy strategy runs over all names in a single rapidfuzz call.
+
+    Returns:
+        Similarities (0-100), in the same order as candidate_names
+    """
+    query_norm = normalize_text(query)
+    names_norm = [normalize_text(name) for name in candidate_names]
+    similarities = [0.0] * len(names_norm)
+
+    if not query_norm:
+        return similarities
+
+    for scorer in _NAME_SCORERS:
+        for _, score, idx in process.extract(
+            query_norm, names_norm, scorer=scorer, processor=None, limit=None
+        ):
+            if score > similarities[idx] and names_norm[idx]:
+                similarities[idx] = score
+
+    return similarities
+
+
+# Countries whose results are dropped unless home is there too, by ISO code
+_OTHER_COUNTRY_CODES = {
+    "ie": "ireland",
+    "gb": "united kingdom",
+    "ca": "canada",
+    "mx": "mexico",
+    "au": "australia",
+}
+
+# The same countries as the last part of an address, in English and in the
+# local-language forms Nominatim's display_name uses by default
+_OTHER_COUNTRY_NAMES = {
+    "ireland": "ireland",
+    "éire": "ireland",
+    "éire / ireland": "ireland",
+    "united kingdom": "united kingdom",
+    "canada": "canada",
+    "mexico": "mexico",
+    "méxico": "mexico",
+    "australia": "australia",
+}
+
+
+def _other_country(
+    address: Optional[str],
+    country_code: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Return the foreign country a place is in, if it is one of the others.
+
+    Uses the place's country code when the source gave one. Otherwise only
+    the last comma-separated component of the address (where OSM puts the
+    country) is compared, as a whole name, so places such as "New Mexico"
+    or "Mexico, Missouri" are not mistaken for Mexico.
+    """
+    if country_code:
+        return _OTHER_COUNTRY_CODES.get(country_code.lower())
+    if not address:
+        return None
+    return _OTHER_COUNTRY_NAMES.get(address.rsplit(",", 1)[-1].strip().lower())
+
+
+MILES_PER_KM = 0.621371
 
-    return max(scores)
+# Haversine with this radius returns miles directly, so scoring never
+# converts per distance
+_EARTH_RADIUS_MILES = routing.EARTH_RADIUS_KM * MILES_PER_KM
 
 
 def km_to_miles(km: float) -> float:
     """Convert kilometers to miles."""
-    return km * 0.621371
+    return km * MILES_PER_KM
 
 
 def calculate_distance_miles(
@@ -171,14 +272,19 @@ def calculate_distance_miles(
     lat2: float, lon2: float,
 ) -> float:
     """Calculate distance in miles between two coordinates."""
-    km = routing.haversine_distance(lat1, lon1, lat2, lon2)
-    return km_to_miles(km)
+    return routing.haversine_distance(lat1, lon1, lat2, lon2, radius=_EARTH_RADIUS_MILES)
+
+
+# Combined score: up to DISTANCE_POINTS for being close (none at or past
+# MAX_SCORE_DISTANCE_MILES), plus half the 0-100 name similarity
+DISTANCE_POINTS = 50
+MAX_SCORE_DISTANCE_MILES = 25.0
 
 
 def calculate_combined_score(
     distance_miles: float,
     name_similarity: float,
-    max_distance: float = 25.0,
+    max_distance: float = MAX_SCORE_DISTANCE_MILES,
 ) -> float:
     """
     Calculate combined score for ranking candidates.
@@ -193,7 +299,7 @@ def calculate_combined_score(
     if distance_miles >= max_distance:
         distance_score = 0
     else:
-        distance_score = 50 * (1 - distance_miles / max_distance)
+        distance_score = DISTANCE_POINTS * (1 - distance_miles / max_distance)
 
     # Name similarity score: direct mapping (0-100 -> 0-50)
     name_score = name_similarity / 2
@@ -213,14 +319,39 @@ def are_same_brand(candidate1: ScoredCandidate, candidate2: ScoredCandidate, thr
     Returns:
         True if candidates appear to be same brand
     """
-    name1 = normalize_text(candidate1.place.name)
-    name2 = normalize_text(candidate2.place.name)
+    return _names_same_brand(candidate1.place.name, candidate2.place.name, threshold)
 
+
+@lru_cache(maxsize=4096)
+def _names_same_brand(name1: str, name2: str, threshold: float) -> bool:
+    """Memoized core of are_same_brand, keyed by the two place names."""
     # Direct similarity between candidate names
-    similarity = calculate_name_similarity(name1, name2)
+    similarity = calculate_name_similarity(
+        normalize_text(name1), normalize_text(name2), score_cutoff=threshold
+    )
     return similarity >= threshold
 
 
+def same_brand_flags(
+    reference: ScoredCandidate,
+    candidates: list[ScoredCandidate],
+    threshold: float = 70.0,
+) -> list[bool]:
+    """
+    Check which candidates are the same brand/chain as a reference.
+
+    Same answers as calling are_same_brand(reference, c) for each
+    candidate, but the names are compared in one batch.
+
+    Returns:
+        One flag per candidate, in order
+    """
+    similarities = calculate_name_similarities(
+        reference.place.name, [c.place.name for c in candidates]
+    )
+    return [similarity >= threshold for similarity in similarities]
+
+
 def score_candidates(
     query: str,
     candidates: list[PlaceSearchResult],
@@ -234,18 +365,20 @@ def score_candidates(
     """
     scored = []
 
-    for candidate in candidates:
-        # Calculate distance from home
-        distance = calculate_distance_miles(
-            home_lat, home_lon,
-            candidate.lat, candidate.lon,
-        )
-
-        # Calculate name similarity
-        similarity = calculate_name_similarity(query, candidate.name)
+    # Name similarity and distance from home for all candidates at once
+    similarities = calculate_name_similarities(query, [c.name for c in candidates])
+    distances = routing.haversine_distances(
+        home_lat, home_lon, [(c.lat, c.lon) for c in candidates],
+        radius=_EARTH_RADIUS_MILES,
+    )
 
-        # Calculate combined score
-        combined = calculate_combined_score(distance, similarity)
+    for candidate, similarity, distance in zip(candidates, similarities, distances):
+        # Calculate combined score (calculate_combined_score, inlined)
+        if distance >= MAX_SCORE_DISTANCE_MILES:
+            distance_score = 0
+        else:
+            distance_score = DISTANCE_POINTS * (1 - distance / MAX_SCORE_DISTANCE_MILES)
+        combined = distance_score + similarity / 2
 
         scored.append(ScoredCandidate(
             place=candidate,
@@ -285,10 +418,20 @@ def apply_home_proximity_tiebreak(
     same_brand_candidates = [top]
     other_candidates = []
 
-    for c in candidates[1:]:
-        if (c.name_similarity >= similarity_threshold and
-            top.name_similarity >= similarity_threshold and
-            are_same_brand(top, c)):
+    # Compare names against the top one in one batch, only for candidates
+    # that match the query strongly enough to be same-brand rivals at all
+    rest = candidates[1:]
+    if top.name_similarity >= similarity_threshold:
+        eligible = [c for c in rest if c.name_similarity >= similarity_threshold]
+        same_brand_ids = {
+            id(c) for c, is_same_brand in zip(eligible, same_brand_flags(top, eligible))
+            if is_same_brand
+        }
+    else:
+        same_brand_ids = set()
+
+    for c in rest:
+        if id(c) in same_brand_ids:
             same_brand_candidates.append(c)
         else:
             other_candidates.append(c)
@@ -339,30 +482,31 @@ def select_best_for_route(
 
     # Calculate total added distance for each candidate
     # (distance from prev stop + distance to home)
-    candidate_route_scores = []
-    for c in candidates:
-        dist_from_prev = calculate_distance_miles(
-            prev_stop_lat, prev_stop_lon,
-            c.place.lat, c.place.lon
-        )
-        dist_to_home = calculate_distance_miles(
-            c.place.lat, c.place.lon,
-            home_lat, home_lon
-        )
-        total_added = dist_from_prev + dist_to_home
-        candidate_route_scores.append((c, total_added))
+    points = [(c.place.lat, c.place.lon) for c in candidates]
+    from_prev = routing.haversine_distances(
+        prev_stop_lat, prev_stop_lon, points, radius=_EARTH_RADIUS_MILES
+    )
+    to_home = routing.haversine_distances(
+        home_lat, home_lon, points, radius=_EARTH_RADIUS_MILES
+    )
+    candidate_route_scores = [
+        (c, prev_miles + home_miles)
+        for c, prev_miles, home_miles in zip(candidates, from_prev, to_home)
+    ]
 
     # Find candidates with high name similarity (same brand)
     top = candidates[0]
     same_brand = [
-        (c, score) for c, score in candidate_route_scores
-        if c.name_similarity >= 70.0 and are_same_brand(top, c)
+        (c, score)
+        for (c, score), is_same_brand in zip(
+            candidate_route_scores, same_brand_flags(top, candidates)
+        )
+        if c.name_similarity >= 70.0 and is_same_brand
     ]
 
     if len(same_brand) > 1:
-        # Sort same-brand by total added distance
-        same_brand.sort(key=lambda x: x[1])
-        best_for_route = same_brand[0][0]
+        # Same-brand candidate with the least total added distance
+        best_for_route = min(same_brand, key=lambda x: x[1])[0]
 
         # If best for route is different from closest to home, mark it
         closest_to_home = min(candidates, key=lambda x: x.distance_miles)
@@ -408,10 +552,11 @@ def should_auto_select(candidates: list[ScoredCandidate]) -> tuple[bool, Selecti
         return True, SelectionReason.BEST_OVERALL_SCORE
 
     # If top is same brand/name but closer, auto-select (home proximity)
-    if (top.name_similarity >= 70 and
+    # (cheap checks first so the fuzzy brand comparison runs last)
+    if (top.distance_miles < second.distance_miles and
+        top.name_similarity >= 70 and
         second.name_similarity >= 70 and
-        are_same_brand(top, second) and
-        top.distance_miles < second.distance_miles):
+        are_same_brand(top, second)):
         return True, SelectionReason.CLOSEST_TO_HOME
 
     return False, SelectionReason.BEST_OVERALL_SCORE
@@ -422,6 +567,7 @@ def filter_osm_results(
     home_lat: float,
     home_lon: float,
     max_distance_miles: float = 25.0,
+    home_address: Optional[str] = None,
 ) -> list[PlaceSearchResult]:
     """
     Filter out obviously wrong OSM results.
@@ -436,6 +582,7 @@ def filter_osm_results(
         home_lat: User's home latitude
         home_lon: User's home longitude
         max_distance_miles: Maximum distance threshold
+        home_address: User's home address, to tell which country home is in
 
     Returns:
         Filtered list of candidates
@@ -445,106 +592,86 @@ def filter_osm_results(
 
     filtered = []
 
-    for candidate in candidates:
-        # Calculate distance
-        distance_km = routing.haversine_distance(
-            home_lat, home_lon,
-            candidate.lat, candidate.lon
-        )
-        distance_miles = km_to_miles(distance_km)
+    # Country the home address is in, if it is one of the others
+    home_country = _other_country(home_address)
 
+    # Distance from home for all candidates at once
+    distances = routing.haversine_distances(
+        home_lat, home_lon, [(c.lat, c.lon) for c in candidates],
+        radius=_EARTH_RADIUS_MILES,
+    )
+
+    for candidate, distance_miles in zip(candidates, distances):
         # Filter by distance
         if distance_miles > max_distance_miles:
             continue
 
         # Filter by country (US only if home is in US)
-        # Check if address contains "United States" or US state abbreviations
-        address_lower = candidate.address.lower()
-
-        # If it explicitly mentions other countries, skip
-        other_countries = ["ireland", "united kingdom", "canada", "mexico", "australia"]
-        if any(country in address_lower for country in other_countries):
-            # Skip unless home is in that country
-            if not any(country in candidate.address.lower() for country in other_countries):
-                continue
+        # If it explicitly mentions other countries, skip unless home is
+        # in that country
+        country = _other_country(candidate.address, candidate.country_code)
+        if country and country != home_country:
+            continue
 
         filtered.append(candidate)
 
     return filtered
 
 
-def resolve_place(
+# Network tier results per query and home, kept no longer than the place
+# caches behind them
+_LOOKUP_MEMO = places._TTLMemo(maxsize=256, ttl_seconds=CACHE_TTL_DAYS * 24 * 60 * 60)
+
+
+def _tiered_lookup(
     query: str,
-    settings: Settings,
-    search_radius_miles: float = OSM_SEARCH_RADIUS_MILES,
-    expand_radius_miles: float = OSM_EXPANDED_RADIUS_MILES,
-    limit: int = 10,
-    prev_stop_lat: Optional[float] = None,
-    prev_stop_lon: Optional[float] = None,
-    is_last_stop: bool = False,
-    return_home: bool = True,
-) -> ResolvedPlace:
+    home_lat: float,
+    home_lon: float,
+    home_address: Optional[str],
+    search_radius_miles: float,
+    expand_radius_miles: float,
+    limit: int,
+) -> tuple[tuple[PlaceSearchResult, ...], Optional[dict]]:
     """
-    Resolve a place query to coordinates using multi-tier strategy:
-    Tier 1: OSM search with filtering
-    Tier 2: Google Places API (if OSM fails or for retail chains)
-    Tier 3: Gemini LLM validation (if available)
-    Tier 4: Tavily web search fallback (if available)
+    Run the network tiers of resolve_place for a normalized query.
 
-    Args:
-        query: User's place query (possibly misspelled)
-        settings: User settings with home location
-        search_radius_miles: Initial search radius
-        expand_radius_miles: Expanded radius if no results
-        limit: Max candidates to return
-        prev_stop_lat: Previous stop latitude (for route optimization)
-        prev_stop_lon: Previous stop longitude (for route optimization)
-        is_last_stop: Whether this is the last stop
-        return_home: Whether returning home after errands
+    resolve_place memoizes the result, so a repeated query near the same
+    home skips OSM, Google, Gemini and Tavily. Raises LookupError when no
+    tier finds anything, so misses (often transient failures) are not
+    memoized.
 
     Returns:
-        ResolvedPlace with candidates and resolution status
+        Tuple of (candidates in tier order, Gemini validation or None)
     """
-    if not settings.has_home_location:
-        return ResolvedPlace(
-            query=query,
-            selected=None,
-            candidates=[],
-            decision=ResolutionDecision.NO_MATCH,
-            decision_reason="Home location not set",
-        )
-
     # Extract user's location context for LLM
     user_city, user_state = "", ""
     if GEMINI_AVAILABLE:
         try:
-            user_city, user_state = extract_location_context(settings.home_address)
+            user_city, user_state = extract_location_context(home_address)
         except Exception:
             user_city, user_state = "", ""
 
     # === TIER 1: OSM Search with Smart Filtering ===
-    normalized_query = normalize_text(query)
-
-    print(f"[TIER 1] Searching OSM for: '{query}'")
+    logger.debug("[TIER 1] Searching OSM for: '%s'", query)
 
     # Search with initial radius
     candidates = places.search_places_nearby(
         query,
-        settings.home_lat,
-        settings.home_lon,
-        radius_km=search_radius_miles / 0.621371,  # Convert to km
+        home_lat,
+        home_lon,
+        radius_km=search_radius_miles / MILES_PER_KM,  # Convert to km
         limit=limit,
     )
 
-    print(f"[TIER 1] OSM found {len(candidates)} candidates")
+    logger.debug("[TIER 1] OSM found %d candidates", len(candidates))
 
     # If no results, try expanded radius (but smaller than before - 25mi max)
     if not candidates:
         candidates = places.search_places_nearby(
             query,
-            settings.home_lat,
-            settings.home_lon,
-            radius_km=expand_radius_miles / 0.621371,
+            home_lat,
+            home_lon,
+            radius_km=expand_radius_miles / MILES_PER_KM,
             limit=limit,
         )
 
@@ -557,39 +684,56 @@ def resolve_place(
     # Filter out obviously wrong results (international, too far, etc.)
     candidates = filter_osm_results(
         candidates,
-        settings.home_lat,
-        settings.home_lon,
+        home_lat,
+        home_lon,
         max_distance_miles=expand_radius_miles,
+        home_address=home_address,
     )
 
+    # Skip the network tiers when OSM alone already has a strong clear winner
+    if candidates:
+        pre_ranked = score_candidates(query, candidates, home_lat, home_lon)
+        auto, reason = should_auto_select(pre_ranked)
+        top = pre_ranked[0]
+        if (auto and reason == SelectionReason.CLEAR_WINNER and
+            top.combined_score >= 85 and top.name_similarity >= 90):
+            logger.debug("[TIER 1] Clear winner %s - skipping tiers 2-4", top.place.name)
+            return tuple(candidates), None
+
     # === TIER 2: Google Places API ===
     # Use Google Places if OSM results are poor or query looks like a retail chain
-    print(f"[TIER 2] GOOGLE_PLACES_AVAILABLE={GOOGLE_PLACES_AVAILABLE}, candidates={len(candidates)}")
+    logger.debug(
+        "[TIER 2] GOOGLE_PLACES_AVAILABLE=%s, candidates=%d",
+        GOOGLE_PLACES_AVAILABLE, len(candidates),
+    )
 
     if not GOOGLE_PLACES_AVAILABLE:
-        print(f"[TIER 2] Google Places API not available - check API key and googlemaps package")
+        logger.debug("[TIER 2] Google Places API not available - check API key and googlemaps package")
     elif should_use_google_places(query, candidates):
-        print(f"[TIER 2] Using Google Places API for query: '{query}'")
+        logger.debug("[TIER 2] Using Google Places API for query: '%s'", query)
         google_result = search_place_with_google(
             query=query,
-            center_lat=settings.home_lat,
-            center_lon=settings.home_lon,
+            center_lat=home_lat,
+            center_lon=home_lon,
             radius_miles=expand_radius_miles,
         )
 
         if google_result:
             # Add Google result to top of candidates
             candidates.insert(0, google_result)
-            print(f"[TIER 2] Google Places found: {google_result.name}")
+            logger.debug("[TIER 2] Google Places found: %s", google_result.name)
         else:
-            print(f"[TIER 2] Google Places found nothing")
+            logger.debug("[TIER 2] Google Places found nothing")
     else:
-        print(f"[TIER 2] Skipped Google Places - OSM results look sufficient")
+        logger.debug("[TIER 2] Skipped Google Places - OSM results look sufficient")
 
     # === TIER 3: Gemini LLM Validation ===
     llm_validation = None
     if GEMINI_AVAILABLE and candidates and user_city and user_state:
-        print(f"[TIER 2] Calling Gemini for validation (city: {user_city}, state: {user_state})")
+        logger.debug(
+            "[TIER 2] Calling Gemini for validation (city: %s, state: %s)",
+            user_city, user_state,
+        )
         llm_validation = validate_and_rank_candidates(
             query=query,
             candidates=candidates,
@@ -598,7 +742,7 @@ def resolve_place(
             max_distance_miles=expand_radius_miles,
         )
 
-        print(f"[TIER 2] Gemini validation: {llm_validation}")
+        logger.debug("[TIER 2] Gemini validation: %s", llm_validation)
 
         # If LLM picked a specific candidate, reorder to put it first
         if llm_validation and llm_validation.get("best_index") is not None:
@@ -606,34 +750,113 @@ def resolve_place(
             if 0 <= best_idx < len(candidates):
                 best_candidate = candidates.pop(best_idx)
                 candidates.insert(0, best_candidate)
-                print(f"[TIER 2] Reordered candidates, best at index 0")
+                logger.debug("[TIER 2] Reordered candidates, best at index 0")
     else:
-        print(f"[TIER 2] Skipped - GEMINI_AVAILABLE:{GEMINI_AVAILABLE}, candidates:{len(candidates) if candidates else 0}, city:{user_city}, state:{user_state}")
+        logger.debug(
+            "[TIER 2] Skipped - GEMINI_AVAILABLE:%s, candidates:%d, city:%s, state:%s",
+            GEMINI_AVAILABLE, len(candidates), user_city, user_state,
+        )
 
     # === TIER 4: Tavily Web Search Fallback ===
     if GEMINI_AVAILABLE and TAVILY_AVAILABLE and should_use_web_search(query, candidates, llm_validation):
-        print(f"[TIER 4] Triggering Tavily web search")
+        logger.debug("[TIER 4] Triggering Tavily web search")
         if user_city and user_state:
             tavily_result = search_place_with_tavily(query, user_city, user_state)
             if tavily_result:
                 # Add Tavily result to top of candidates
                 candidates.insert(0, tavily_result)
-                print(f"[TIER 4] Tavily found: {tavily_result.name}")
+                logger.debug("[TIER 4] Tavily found: %s", tavily_result.name)
             else:
-                print(f"[TIER 4] Tavily returned no results")
+                logger.debug("[TIER 4] Tavily returned no results")
     else:
-        print(f"[TIER 4] Skipped - should_use_web_search returned False or services unavailable")
+        logger.debug("[TIER 4] Skipped - should_use_web_search returned False or services unavailable")
 
-    # If no candidates after all tiers, return NO_MATCH
     if not candidates:
+        raise LookupError(f"No places found for '{query}'")
+    return tuple(candidates), llm_validation
+
+
+def resolve_place(
+    query: str,
+    settings: Settings,
+    search_radius_miles: float = OSM_SEARCH_RADIUS_MILES,
+    expand_radius_miles: float = OSM_EXPANDED_RADIUS_MILES,
+    limit: int = 10,
+    prev_stop_lat: Optional[float] = None,
+    prev_stop_lon: Optional[float] = None,
+    is_last_stop: bool = False,
+    return_home: bool = True,
+) -> ResolvedPlace:
+    """
+    Resolve a place query to coordinates using multi-tier strategy:
+    Tier 1: OSM search with filtering
+    Tier 2: Google Places API (if OSM fails or for retail chains)
+    Tier 3: Gemini LLM validation (if available)
+    Tier 4: Tavily web search fallback (if available)
+
+    The tiers are memoized per stripped query and home location (rounded
+    to about 100 m); scoring and the auto-select decision always rerun.
+
+    Args:
+        query: User's place query (possibly misspelled)
+        settings: User settings with home location
+        search_radius_miles: Initial search radius
+        expand_radius_miles: Expanded radius if no results
+        limit: Max candidates to return
+        prev_stop_lat: Previous stop latitude (for route optimization)
+        prev_stop_lon: Previous stop longitude (for route optimization)
+        is_last_stop: Whether this is the last stop
+        return_home: Whether returning home after errands
+
+    Returns:
+        ResolvedPlace with candidates and resolution status
+    """
+    if not settings.has_home_location:
         return ResolvedPlace(
             query=query,
             selected=None,
             candidates=[],
             decision=ResolutionDecision.NO_MATCH,
-            decision_reason=f"No places found for '{query}'",
+            decision_reason="Home location not set",
         )
 
+    # Only the memo key is rounded; the tiers search from the exact home
+    lookup_key = (
+        query.strip(),
+        round(settings.home_lat, 3),
+        round(settings.home_lon, 3),
+        settings.home_address,
+        search_radius_miles,
+        expand_radius_miles,
+        limit,
+    )
+    found_memo, lookup = _LOOKUP_MEMO.get(lookup_key)
+    if not found_memo:
+        try:
+            lookup = _tiered_lookup(
+                query.strip(),
+                settings.home_lat,
+                settings.home_lon,
+                settings.home_address,
+                search_radius_miles,
+                expand_radius_miles,
+                limit,
+            )
+        except LookupError:
+            # If no candidates after all tiers, return NO_MATCH
+            return ResolvedPlace(
+                query=query,
+                selected=None,
+                candidates=[],
+                decision=ResolutionDecision.NO_MATCH,
+                decision_reason=f"No places found for '{query}'",
+            )
+        _LOOKUP_MEMO.put(lookup_key, lookup)
+    found, llm_validation = lookup
+
+    # Hand out copies so callers can't mutate the memoized results
+    candidates = [candidate.model_copy() for candidate in found]
+
     # Score and rank candidates
     scored = score_candidates(
         query,
@@ -732,14 +955,22 @@ def resolve_multiple(
     """
     Resolve multiple place queries.
 
+    Queries are resolved concurrently on a small thread pool: resolution
+    is mostly waiting on OSM, Google, Gemini and Tavily. Nominatim's own
+    rate limit still spaces out OSM requests across threads.
+
     Args:
         queries: List of place queries
         settings: User settings
 
     Returns:
-        List of ResolvedPlace objects
+        List of ResolvedPlace objects, in query order
     """
-    return [resolve_place(q, settings) for q in queries if q.strip()]
+    queries = [q for q in queries if q.strip()]
+    if not queries:
+        return []
+    with ThreadPoolExecutor(max_workers=min(4, len(queries))) as executor:
+        return list(executor.map(lambda q: resolve_place(q, settings), queries))
 
 
 def any_needs_disambiguation(resolved_list: list[ResolvedPlace]) -> bool:
@@ -2,6 +2,7 @@
 
 import hashlib
 import json
+import logging
 import math
 from typing import Optional
 
@@ -16,19 +17,30 @@ from orbit.config import (
 )
 from orbit.models import RouteResult
 
+logger = logging.getLogger(__name__)
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_distance(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    radius: float = EARTH_RADIUS_KM,
+) -> float:
     """
     Calculate the great circle distance between two points in kilometers.
 
     Args:
         lat1, lon1: First point coordinates
         lat2, lon2: Second point coordinates
+        radius: Earth's radius; pass it in miles to get miles back
 
     Returns:
-        Distance in kilometers
+        Distance in kilometers (or in the unit of radius)
     """
-    R = 6371  # Earth's radius in kilometers
+    R = radius
 
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
@@ -44,6 +56,42 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def haversine_distances(
+    lat: float,
+    lon: float,
+    points: list[tuple[float, float]],
+    radius: float = EARTH_RADIUS_KM,
+) -> list[float]:
+    """
+    Calculate great circle distances from one origin to many points.
+
+    Equivalent to calling haversine_distance for each point, but the
+    origin's radians and cosine are computed only once.
+
+    Args:
+        lat, lon: Origin coordinates
+        points: List of (lat, lon) tuples
+        radius: Earth's radius; pass it in miles to get miles back
+
+    Returns:
+        Distances in kilometers (or in the unit of radius), in the same
+        order as points
+    """
+    R = radius
+
+    lat_rad = math.radians(lat)
+    cos_lat = math.cos(lat_rad)
+    distances = []
+    for p_lat, p_lon in points:
+        p_lat_rad = math.radians(p_lat)
+        a = (
+            math.sin((p_lat_rad - lat_rad) / 2) ** 2
+            + cos_lat * math.cos(p_lat_rad) * math.sin(math.radians(p_lon - lon) / 2) ** 2
+        )
+        distances.append(R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+    return distances
+
+
 def _get_route_cache_key(lat1: float, lon1: float, lat2: float, lon2: float) -> str:
     """Generate a cache key for a route."""
     content = json.dumps([lat1, lon1, lat2, lon2], sort_keys=True)
@@ -102,7 +150,56 @@ def get_route_osrm(
         return None
 
     except requests.RequestException as e:
-        print(f"OSRM routing error: {e}")
+        logger.warning("OSRM routing error: %s", e)
+        return None
+
+
+def get_route_matrix_osrm(
+    locations: list[tuple[float, float]],
+) -> Optional[tuple[list[list[float]], list[list[float]]]]:
+    """
+    Get travel distances and durations between all locations from OSRM.
+
+    Uses the /table service, so the whole matrix costs a single request
+    instead of one /route request per pair.
+
+    Args:
+        locations: List of (lat, lon) tuples
+
+    Returns:
+        Tuple of (distance_matrix_km, duration_matrix_minutes) if successful,
+        None otherwise (including when any pair has no route)
+    """
+    try:
+        # OSRM expects lon,lat order
+        coords = ";".join(f"{lon},{lat}" for lat, lon in locations)
+        response = requests.get(
+            f"{OSRM_BASE_URL}/table/v1/driving/{coords}",
+            params={"annotations": "duration,distance"},
+            timeout=OSRM_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get("code") != "Ok":
+            return None
+        durations = data.get("durations")
+        distances = data.get("distances")
+        if not durations or not distances:
+            return None
+
+        # Convert meters to km and seconds to minutes, rounded like get_route
+        distance_matrix = [
+            [round(meters / 1000, 2) for meters in row] for row in distances
+        ]
+        duration_matrix = [
+            [round(seconds / 60, 1) for seconds in row] for row in durations
+        ]
+        return distance_matrix, duration_matrix
+
+    except (requests.RequestException, TypeError) as e:
+        # TypeError covers null entries for unroutable pairs
+        logger.warning("OSRM table error: %s", e)
         return None
 
 
@@ -152,6 +249,7 @@ def get_route(
     dest_lat: float,
     dest_lon: float,
     use_cache: bool = True,
+    need_geometry: bool = False,
 ) -> RouteResult:
     """
     Get route between two points.
@@ -163,21 +261,30 @@ def get_route(
         origin_lat, origin_lon: Origin coordinates
         dest_lat, dest_lon: Destination coordinates
         use_cache: Whether to use/store cache
+        need_geometry: Skip cached OSRM legs that have no geometry (legs
+            cached from a /table request only carry distance and time)
 
     Returns:
         RouteResult
     """
     # Check cache
+    cached_leg = None
     if use_cache:
         cache_key = _get_route_cache_key(origin_lat, origin_lon, dest_lat, dest_lon)
         cached = db.get_cache(cache_key)
         if cached:
-            data = json.loads(cached)
-            return RouteResult(**data)
+            result = RouteResult(**json.loads(cached))
+            if not (need_geometry and result.geometry is None and result.source == "osrm"):
+                return result
+            cached_leg = result
 
     # Try OSRM
     result = get_route_osrm(origin_lat, origin_lon, dest_lat, dest_lon)
 
+    # Without OSRM, a cached OSRM leg (just lacking geometry) beats an estimate
+    if result is None and cached_leg is not None:
+        return cached_leg
+
     # Fall back to haversine if OSRM fails
     if result is None:
         result = get_route_fallback(origin_lat, origin_lon, dest_lat, dest_lon)
@@ -189,12 +296,77 @@ def get_route(
     return result
 
 
+def get_leg_routes(
+    locations: list[tuple[float, float]],
+    legs: list[tuple[int, int]],
+) -> tuple[dict[tuple[int, int], tuple[float, float]], list[tuple[int, int]]]:
+    """
+    Look up many legs between locations without routing each one.
+
+    Legs come from the route cache first. Any that are missing come from
+    one OSRM /table request over just the locations they touch, and those
+    legs are written back to the cache for get_route and later calls.
+
+    Args:
+        locations: List of (lat, lon) tuples
+        legs: (from, to) index pairs into locations
+
+    Returns:
+        Tuple of ((duration_minutes, distance_km) by leg, legs still unknown
+        because OSRM had no table for them)
+    """
+    found: dict[tuple[int, int], tuple[float, float]] = {}
+    missing: list[tuple[int, int]] = []
+    for leg in legs:
+        cached = db.get_cache(_get_route_cache_key(*locations[leg[0]], *locations[leg[1]]))
+        if cached:
+            route = RouteResult(**json.loads(cached))
+            found[leg] = (route.duration_minutes, route.distance_km)
+        else:
+            missing.append(leg)
+
+    involved = sorted({i for leg in missing for i in leg})
+    if len(involved) < 2:
+        return found, missing
+
+    table = get_route_matrix_osrm([locations[i] for i in involved])
+    if table is None:
+        return found, missing
+
+    distances, durations = table
+    position = {i: pos for pos, i in enumerate(involved)}
+    for a, b in missing:
+        (lat1, lon1), (lat2, lon2) = locations[a], locations[b]
+        distance_km = distances[position[a]][position[b]]
+        duration_minutes = durations[position[a]][position[b]]
+        route = RouteResult(
+            origin_lat=lat1,
+            origin_lon=lon1,
+            dest_lat=lat2,
+            dest_lon=lon2,
+            distance_km=distance_km,
+            duration_minutes=duration_minutes,
+            source="osrm",
+        )
+        db.set_cache(
+            _get_route_cache_key(lat1, lon1, lat2, lon2),
+            route.model_dump_json(),
+            CACHE_TTL_DAYS,
+        )
+        found[(a, b)] = (duration_minutes, distance_km)
+    return found, []
+
+
 def build_distance_matrix(
     locations: list[tuple[float, float]],
 ) -> tuple[list[list[float]], list[list[float]]]:
     """
     Build NxN matrices of distances and travel times between all location pairs.
 
+    Uses cached legs and a single OSRM table request for the rest (see
+    get_leg_routes), then falls back to routing each remaining pair with
+    get_route.
+
     Args:
         locations: List of (lat, lon) tuples
 
@@ -205,15 +377,19 @@ def build_distance_matrix(
     distances = [[0.0] * n for _ in range(n)]
     durations = [[0.0] * n for _ in range(n)]
 
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                route = get_route(
-                    locations[i][0], locations[i][1],
-                    locations[j][0], locations[j][1],
-                )
-                distances[i][j] = route.distance_km
-                durations[i][j] = route.duration_minutes
+    legs = [(i, j) for i in range(n) for j in range(n) if i != j]
+    found, missing = get_leg_routes(locations, legs)
+    for (i, j), (duration_minutes, distance_km) in found.items():
+        durations[i][j] = duration_minutes
+        distances[i][j] = distance_km
+
+    for i, j in missing:
+        route = get_route(
+            locations[i][0], locations[i][1],
+            locations[j][0], locations[j][1],
+        )
+        distances[i][j] = route.distance_km
+        durations[i][j] = route.duration_minutes
 
     return distances, durations
 
@@ -262,6 +438,7 @@ def get_route_geometry(waypoints: list[tuple[float, float]]) -> list[Optional[st
         route = get_route(
             waypoints[i][0], waypoints[i][1],
             waypoints[i + 1][0], waypoints[i + 1][1],
+            need_geometry=True,
         )
         geometries.append(route.geometry)
     return geometries
@@ -0,0 +1,21 @@
+"""Compact JSON helpers that use orjson when it's installed."""
+
+import json
+
+# orjson is optional; fall back to the stdlib json module when it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: str | bytes):
+    """Parse JSON, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj) -> str:
+    """Serialize to compact JSON, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
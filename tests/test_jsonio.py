@@ -0,0 +1,30 @@
+"""Tests for the shared JSON helpers."""
+
+from unittest.mock import patch
+
+import pytest
+
+from orbit.utils import jsonio
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+class TestJsonIO:
+    """Tests run with orjson (when installed) and with the stdlib fallback."""
+
+    def _patched(self, use_orjson):
+        if use_orjson and jsonio.orjson is None:
+            pytest.skip("orjson not installed")
+        return patch.object(jsonio, "orjson", jsonio.orjson if use_orjson else None)
+
+    def test_dumps_compact(self, use_orjson):
+        """Output has no spaces after separators."""
+        with self._patched(use_orjson):
+            assert jsonio.json_dumps({"a": [1, 2], "b": None}) == '{"a":[1,2],"b":null}'
+
+    def test_round_trip(self, use_orjson):
+        """Loads accepts both str and bytes and undoes dumps."""
+        data = {"work_start": "09:00", "return_home": True, "lat": 30.25}
+        with self._patched(use_orjson):
+            text = jsonio.json_dumps(data)
+            assert jsonio.json_loads(text) == data
+            assert jsonio.json_loads(text.encode()) == data
@@ -1,7 +1,11 @@
 """Tests for the places service."""
 
+import json
+from unittest.mock import MagicMock, patch
+
 import pytest
 
+from orbit.models import PlaceSearchResult
 from orbit.services import places
 
 
@@ -23,6 +27,16 @@ class TestDetectInputType:
         """Detect address with zip code."""
         assert places.detect_input_type("Austin 78701") == "address"
 
+    def test_detect_address_with_state(self):
+        """Detect address with a state abbreviation as a whole word."""
+        assert places.detect_input_type("Round Rock TX") == "address"
+        assert places.detect_input_type("Texas Roadhouse") == "name"
+
+    def test_street_word_must_be_whole_word(self):
+        """Street types only count as whole words."""
+        assert places.detect_input_type("Stripes") == "name"
+        assert places.detect_input_type("Elm St.") == "address"
+
     def test_detect_place_name(self):
         """Detect place names."""
         assert places.detect_input_type("Starbucks") == "name"
@@ -31,6 +45,77 @@ class TestDetectInputType:
         assert places.detect_input_type("Chase Bank") == "name"
 
 
+class TestStructuredParams:
+    """Tests for structured Nominatim query parsing."""
+
+    def test_full_address(self):
+        """A full US address is split into structured fields."""
+        params = places._structured_params_from_address("123 Main St, Austin, TX 78701")
+        assert params == {
+            "street": "123 Main St",
+            "city": "Austin",
+            "state": "TX",
+            "postalcode": "78701",
+            "country": "us",
+        }
+
+    def test_city_and_state_in_one_part(self):
+        """City, state and zip without separating commas."""
+        params = places._structured_params_from_address("456 Oak Ave, Austin TX")
+        assert params["city"] == "Austin"
+        assert params["state"] == "TX"
+
+    def test_full_state_name(self):
+        """A spelled-out state is recognized as the state, not the city."""
+        params = places._structured_params_from_address("123 Main St, Austin, Texas")
+        assert params["city"] == "Austin"
+        assert params["state"] == "TX"
+
+    def test_district_of_columbia(self):
+        """DC counts as a state."""
+        params = places._structured_params_from_address(
+            "1600 Pennsylvania Ave NW, Washington, DC 20500"
+        )
+        assert params["city"] == "Washington"
+        assert params["state"] == "DC"
+        assert params["postalcode"] == "20500"
+
+    def test_ambiguous_address_falls_back(self):
+        """Extra components such as a county are left to free text."""
+        assert places._structured_params_from_address(
+            "123 Main St, Austin, Travis County, TX 78701"
+        ) is None
+        assert places._structured_params_from_address("123 Main St, Austin") is None
+
+    def test_free_text_falls_back(self):
+        """Inputs without a numbered street aren't structured."""
+        assert places._structured_params_from_address("Starbucks") is None
+        assert places._structured_params_from_address("Main Street, Austin") is None
+        assert places._structured_params_from_address("123 Main St") is None
+
+
+class TestCacheKey:
+    """Tests for cache key generation."""
+
+    def test_same_args_same_key(self):
+        """Identical arguments produce identical keys."""
+        key1 = places._get_cache_key("geocode", "123 Main St")
+        key2 = places._get_cache_key("geocode", "123 Main St")
+        assert key1 == key2
+        assert key1.startswith("geocode:")
+
+    def test_argument_boundaries_distinct(self):
+        """Splitting a string across arguments changes the key."""
+        assert places._get_cache_key("k", "a b") != places._get_cache_key("k", "a", "b")
+        assert places._get_cache_key("k", "1") != places._get_cache_key("k", 1)
+        assert places._get_cache_key("k", None) != places._get_cache_key("k", "")
+
+    def test_separator_inside_string_distinct(self):
+        """A string holding the type tag byte can't mimic two arguments."""
+        assert places._get_cache_key("k", "a\x1fb") != places._get_cache_key("k", "a", "b")
+        assert places._get_cache_key("k", "a\x1e") != places._get_cache_key("k", "a", 0.0)
+
+
 class TestHaversineDistance:
     """Tests for haversine distance calculation."""
 
@@ -67,6 +152,200 @@ class TestGeocode:
         assert abs(result.lon - (-77.0365)) < 0.01
 
 
+class TestGeocodeMemoization:
+    """Tests for the in-process geocode cache."""
+
+    def setup_method(self):
+        places._GEOCODE_MEMO.clear()
+
+    def teardown_method(self):
+        places._GEOCODE_MEMO.clear()
+
+    def test_repeat_lookup_skips_db(self):
+        """A normalized repeat lookup is served without touching SQLite."""
+        cached = '{"name": "Home", "address": "1 Main St", "lat": 30.0, "lon": -97.0, "source": "nominatim"}'
+        with patch.object(places.db, "get_cache", return_value=cached) as mock_get:
+            first = places.geocode_address("1 Main St")
+            second = places.geocode_address("  1 MAIN ST ")
+
+        assert mock_get.call_count == 1
+        assert first == second
+        assert first is not second
+
+    def test_sends_address_as_typed(self):
+        """Only the memo key is case-folded; Nominatim gets the original text."""
+        with patch.object(places, "_search_address", return_value=[]) as mock_search:
+            places.geocode_address("  1 Main St, Austin ")
+
+        assert mock_search.call_args.args[0] == "1 Main St, Austin"
+
+    def test_entries_expire(self):
+        """Memoized results are looked up again once their time is up."""
+        memo = places._TTLMemo(maxsize=2, ttl_seconds=10)
+        with patch.object(places.time, "monotonic", return_value=100.0):
+            memo.put("a", 1)
+            assert memo.get("a") == (True, 1)
+        with patch.object(places.time, "monotonic", return_value=110.0):
+            assert memo.get("a") == (False, None)
+
+    def test_size_is_bounded(self):
+        """The least recently used entry is evicted when the memo is full."""
+        memo = places._TTLMemo(maxsize=2, ttl_seconds=10)
+        memo.put("a", 1)
+        memo.put("b", 2)
+        memo.get("a")
+        memo.put("c", 3)
+
+        assert memo.get("b") == (False, None)
+        assert memo.get("a") == (True, 1)
+        assert memo.get("c") == (True, 3)
+
+
+class TestReverseGeocode:
+    """Tests for reverse geocoding."""
+
+    def test_nearby_fixes_share_cache(self):
+        """Coordinates within rounding distance hit the same cache entry."""
+        places._REVERSE_MEMO.clear()
+        response = MagicMock()
+        response.content = b'{"display_name": "1 Main St, Austin, TX"}'
+        with patch.object(places, "_rate_limit"), \
+                patch.object(places.requests, "get", return_value=response) as mock_get:
+            first = places.reverse_geocode(37.774912, -122.419421)
+            places._REVERSE_MEMO.clear()
+            second = places.reverse_geocode(37.774909, -122.419418)
+
+        assert first == second == "1 Main St, Austin, TX"
+        assert mock_get.call_count == 1
+        places._REVERSE_MEMO.clear()
+
+    def test_memo_entries_expire(self):
+        """Memoized addresses are looked up again once their TTL has passed."""
+        places._REVERSE_MEMO.clear()
+        with patch.object(places.db, "get_cache", return_value="1 Main St") as mock_get:
+            places.reverse_geocode(30.0, -97.0)
+            places.reverse_geocode(30.0, -97.0)
+            assert mock_get.call_count == 1
+
+            with patch.object(places._REVERSE_MEMO, "ttl_seconds", 0):
+                places._REVERSE_MEMO.clear()
+                places.reverse_geocode(30.0, -97.0)
+                places.reverse_geocode(30.0, -97.0)
+
+        assert mock_get.call_count == 3
+        places._REVERSE_MEMO.clear()
+
+
+class TestGeocodeBatch:
+    """Tests for batch geocoding."""
+
+    def test_preserves_order_and_dedupes(self):
+        """Results line up with inputs and duplicates are looked up once."""
+        def fake_geocode(address):
+            if address == "nowhere":
+                return None
+            return PlaceSearchResult(name=address, address=address, lat=30.0, lon=-97.0)
+
+        with patch.object(places, "geocode_address", side_effect=fake_geocode) as mock_geocode:
+            results = places.geocode_batch(["a st", "nowhere", "b st", "a st"])
+
+        assert [r.name if r else None for r in results] == ["a st", None, "b st", "a st"]
+        assert results[0] is not results[3]
+        assert mock_geocode.call_count == 3
+
+
+class TestGeocodeMulti:
+    """Tests for multi-result geocoding."""
+
+    def _mock_response(self, results):
+        response = MagicMock()
+        response.content = json.dumps(results).encode()
+        return response
+
+    def test_bias_orders_by_precision_then_distance(self):
+        """Within a precision bucket, results closest to the bias point come first."""
+        results = [
+            {"display_name": "Far House, TX", "lat": "31.0", "lon": "-97.0",
+             "type": "house", "importance": 0.9, "osm_id": 1},
+            {"display_name": "Some City, TX", "lat": "30.0", "lon": "-97.0",
+             "type": "city", "importance": 0.9, "osm_id": 2},
+            {"display_name": "Near House, TX", "lat": "30.01", "lon": "-97.0",
+             "type": "house", "importance": 0.1, "osm_id": 3},
+        ]
+        with patch.object(places, "_rate_limit"), \
+                patch.object(places.requests, "get", return_value=self._mock_response(results)):
+            geocoded = places.geocode_address_multi("house", bias_lat=30.0, bias_lon=-97.0)
+
+        assert [g.name for g in geocoded] == ["Near House", "Far House", "Some City"]
+
+    def test_cache_round_trip(self):
+        """Cached results decode back to equal GeocodedAddress objects."""
+        geocoded = [
+            places.GeocodedAddress(
+                name="Home", address="1 Main St", lat=30.0, lon=-97.0,
+                precision="exact", osm_id="42", place_type="house", importance=0.5,
+            ),
+        ]
+
+        assert places._load_geocoded(places._dump_geocoded(geocoded)) == geocoded
+        assert places._load_geocoded('[{"name": "Home"}]') is None
+
+    def test_geocoded_address_is_slotted(self):
+        """GeocodedAddress has no __dict__, so ad-hoc attributes are rejected."""
+        g = places.GeocodedAddress(name="Home", address="1 Main St", lat=30.0, lon=-97.0, precision="exact")
+
+        with pytest.raises(AttributeError):
+            g._distance = 1.0
+
+
+class TestNegativeCache:
+    """Tests for short-lived caching of failed lookups."""
+
+    def test_failed_search_not_retried(self):
+        """A failed nearby search is served from cache on retry."""
+        error = places.requests.ConnectionError("offline")
+        with patch.object(places, "_rate_limit"), \
+                patch.object(places.requests, "get", side_effect=error) as mock_get:
+            assert places.search_places_nearby("coffee", 30.0, -97.0) == []
+            assert places.search_places_nearby("coffee", 30.0, -97.0) == []
+
+        assert mock_get.call_count == 1
+
+    def test_failed_reverse_not_retried(self):
+        """A failed reverse geocode is not retried while the failure is cached."""
+        places._REVERSE_MEMO.clear()
+        error = places.requests.ConnectionError("offline")
+        with patch.object(places, "_rate_limit"), \
+                patch.object(places.requests, "get", side_effect=error) as mock_get:
+            assert places.reverse_geocode(30.0, -97.0) is None
+            assert places.reverse_geocode(30.0, -97.0) is None
+
+        assert mock_get.call_count == 1
+        places._REVERSE_MEMO.clear()
+
+
+class TestSearchViewbox:
+    """Tests for the nearby-search bounding box."""
+
+    def _viewbox(self, center_lat):
+        response = MagicMock()
+        response.content = b"[]"
+        with patch.object(places, "_rate_limit"), \
+                patch.object(places.requests, "get", return_value=response) as mock_get:
+            places.search_places_nearby("coffee", center_lat, -97.0, radius_km=11.1)
+        return [float(v) for v in mock_get.call_args.kwargs["params"]["viewbox"].split(",")]
+
+    def test_equator_box_is_square(self):
+        """At the equator a degree of longitude is as wide as one of latitude."""
+        left, top, right, bottom = self._viewbox(0.0)
+        assert (right - left) == pytest.approx(top - bottom)
+
+    def test_longitude_widens_with_latitude(self):
+        """At 60 degrees the longitude span is about twice the latitude span."""
+        left, top, right, bottom = self._viewbox(60.0)
+        assert (right - left) == pytest.approx(2 * (top - bottom), rel=1e-3)
+
+
 class TestPlaceSearchResult:
     """Tests for PlaceSearchResult model."""
 
@@ -1,12 +1,14 @@
 """Tests for the planner service."""
 
+import json
 from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
 
 import pytest
 
 from orbit import db
 from orbit.models import FixedBlock, Settings, Task
-from orbit.services import planner
+from orbit.services import planner, routing
 
 
 class TestTimeWindow:
@@ -80,6 +82,17 @@ class TestTimeWindow:
 
         assert window1.intersection(window2) is None
 
+    def test_slotted(self):
+        """Test that windows carry no per-instance __dict__."""
+        window = planner.TimeWindow(
+            start=datetime(2024, 1, 1, 9, 0),
+            end=datetime(2024, 1, 1, 10, 0),
+        )
+
+        assert not hasattr(window, "__dict__")
+        window.start = datetime(2024, 1, 1, 9, 30)
+        assert window.duration_minutes == 30.0
+
 
 class TestParseTime:
     """Tests for time parsing."""
@@ -94,6 +107,10 @@ class TestParseTime:
         assert t.hour == 14
         assert t.minute == 30
 
+    def test_parse_time_is_memoized(self):
+        """Test that repeated time strings are parsed once."""
+        assert planner.parse_time("08:15") is planner.parse_time("08:15")
+
 
 class TestFeasibleWindow:
     """Tests for feasible window calculation."""
@@ -214,6 +231,135 @@ class TestFreeWindows:
         assert windows[1].end.hour == 17
 
 
+class TestBusyIntervals:
+    """Tests for the sorted busy interval list."""
+
+    def test_overlap_detection(self):
+        """Test overlaps against disjoint intervals; touching is not overlap."""
+        busy = planner._BusyIntervals()
+        busy.add(180, 240)
+        busy.add(0, 60)
+
+        assert busy.overlaps(210, 300)
+        assert busy.overlaps(-60, 480)
+        assert not busy.overlaps(60, 180)
+        assert not busy.overlaps(240, 300)
+
+    def test_merges_overlapping_intervals(self):
+        """Test that a long interval is still seen behind a shorter one."""
+        busy = planner._BusyIntervals()
+        busy.add(0, 480)
+        busy.add(60, 120)
+
+        assert busy.starts == [0]
+        assert busy.ends == [480]
+        assert busy.overlaps(180, 240)
+
+
+class TestTicks:
+    """Tests for the planner's integer clock."""
+
+    def test_round_trip(self):
+        """Test datetime to ticks and back."""
+        origin = datetime(2024, 1, 1, 9, 0)
+        dt = datetime(2024, 1, 1, 10, 30, 15, 250)
+
+        ticks = planner._to_ticks(dt, origin)
+
+        assert ticks == 5415000250
+        assert planner._from_ticks(ticks, origin) == dt
+
+    def test_minutes_match_timedelta(self):
+        """Test minute conversion matches timedelta arithmetic."""
+        origin = datetime(2024, 1, 1, 9, 0)
+
+        for minutes in (0, 12.3, 7.7, 45, 0.1):
+            expected = origin + timedelta(minutes=minutes)
+            assert planner._from_ticks(planner._minutes_to_ticks(minutes), origin) == expected
+
+
+class TestSelectBest:
+    """Tests for the greedy candidate selection."""
+
+    def test_prefers_higher_score_and_skips_infeasible(self):
+        """Test scoring, window checks and restriction to remaining."""
+        busy = planner._BusyIntervals()
+        args = dict(
+            travel_minutes=[0.0, 10.0, 5.0, 1.0],
+            travel_ticks=[0, 600, 300, 60],
+            window_starts=[0, 0, 0],
+            window_ends=[1000, 1000, 100],
+            durations=[100, 100, 100],
+            priority_scores=[30.0, 30.0, 90.0],
+            current_time=0,
+            day_end=1000,
+            busy=busy,
+        )
+
+        # Candidate 2 scores best but cannot finish inside its window
+        assert planner._select_best([0, 1, 2], **args) == (1, 300)
+        assert planner._select_best([0], **args) == (0, 600)
+
+        busy.add(350, 500)
+        assert planner._select_best([0, 1, 2], **args) == (0, 600)
+
+
+class TestTwoOpt:
+    """Tests for the 2-opt pass over the errand order."""
+
+    # Home at 0, candidate 0 at 10 and candidate 1 at 5 on a straight road
+    MINUTES = [[0.0, 10.0, 5.0], [10.0, 0.0, 5.0], [5.0, 5.0, 0.0]]
+    TICKS = [[0, 10, 5], [10, 0, 5], [5, 5, 0]]
+
+    def _two_opt(self, route, window_ends, return_home=False, window_starts=(0, 0)):
+        return planner._two_opt(
+            route,
+            self.MINUTES,
+            self.TICKS,
+            window_starts=list(window_starts),
+            window_ends=window_ends,
+            durations=[10, 10],
+            day_end=1000,
+            busy=planner._BusyIntervals(),
+            return_home=return_home,
+        )
+
+    def test_reverses_backtracking(self):
+        """Test that an order that doubles back is untangled."""
+        assert self._two_opt([0, 1], window_ends=[1000, 1000]) == [1, 0]
+
+    def test_keeps_order_that_windows_require(self):
+        """Test that a shorter order is rejected when an errand would miss its window."""
+        assert self._two_opt([0, 1], window_ends=[20, 1000]) == [0, 1]
+
+    def test_keeps_order_that_finishes_earlier(self):
+        """Test that less driving is rejected when it means waiting for a place to open."""
+        route = self._two_opt([0, 1], window_ends=[1000, 1000], window_starts=[0, 100])
+
+        assert route == [0, 1]
+
+    def test_counts_drive_home(self):
+        """Test that a round trip costs the same either way, so nothing moves."""
+        assert self._two_opt([0, 1], [1000, 1000], return_home=True) == [0, 1]
+
+    def test_route_times(self):
+        """Test timing an order, including busy time that blocks it."""
+        busy = planner._BusyIntervals()
+        args = dict(
+            ticks_matrix=self.TICKS,
+            window_starts=[0, 30],
+            window_ends=[1000, 1000],
+            durations=[10, 10],
+            day_end=1000,
+            busy=busy,
+        )
+
+        assert planner._route_times([1, 0], **args) == [(5, 30, 40), (45, 45, 55)]
+
+        busy.add(50, 60)
+        assert planner._route_times([1, 0], **args) is None
+
+
 class TestPriorityScore:
     """Tests for priority score calculation."""
 
@@ -320,6 +466,179 @@ class TestGeneratePlan:
         assert result.total_travel_km >= 0
         assert result.total_travel_minutes >= 0
 
+    def test_records_assumptions(self, sample_settings):
+        """Test that plan assumptions are stored as compact JSON."""
+        result = planner.generate_plan(date.today(), sample_settings, return_home=False)
+
+        assert json.loads(result.plan.assumptions_json) == {
+            "work_start": "09:00",
+            "work_end": "17:00",
+            "return_home": False,
+            "home_address": sample_settings.home_address,
+        }
+        assert ", " not in result.plan.assumptions_json.replace(sample_settings.home_address, "")
+
+    def test_persists_plan_items(self, sample_settings, sample_tasks):
+        """Test that every scheduled item is saved in order."""
+        today = date.today()
+
+        result = planner.generate_plan(today, sample_settings)
+        saved = db.get_plan_items(result.plan.id)
+
+        assert [item.title for item in saved] == [item.title for item in result.items]
+        assert [item.order_index for item in saved] == list(range(len(result.items)))
+
+    def test_home_only_day_skips_routing(self, sample_settings):
+        """Test that a day without errands never asks for a route."""
+        db.save_task(Task(title="Write report", category="deep_work", duration_minutes=60))
+
+        with patch("orbit.services.planner.routing.get_route") as mock_route:
+            result = planner.generate_plan(date.today(), sample_settings)
+
+        mock_route.assert_not_called()
+        assert [item.type for item in result.items] == ["task"]
+        assert result.total_travel_km == 0
+
+    def test_colocated_errands_share_legs(self, sample_settings):
+        """Test that errands at the same spot are routed as one stop."""
+        for title in ("Pharmacy", "Photo counter"):
+            db.save_task(Task(
+                title=title,
+                category="errand",
+                duration_minutes=15,
+                location_name="Mall",
+                lat=30.2800,
+                lon=-97.7300,
+            ))
+        planner._cached_route.cache_clear()
+
+        with patch(
+            "orbit.services.planner.routing.get_route_matrix_osrm", return_value=None
+        ), patch(
+            "orbit.services.planner.routing.get_route",
+            side_effect=routing.get_route_fallback,
+        ) as mock_route:
+            result = planner.generate_plan(date.today(), sample_settings)
+
+        # home -> mall, mall -> mall and mall -> home
+        assert mock_route.call_count == 3
+        assert len([item for item in result.items if item.type == "task"]) == 2
+
+    def test_uses_osrm_table_when_available(self, sample_settings):
+        """Test that one table lookup replaces per-leg routing."""
+        db.save_task(Task(
+            title="Pharmacy",
+            category="errand",
+            duration_minutes=15,
+            location_name="Pharmacy",
+            lat=30.2800,
+            lon=-97.7300,
+        ))
+        table = ([[0.0, 4.2], [4.4, 0.0]], [[0.0, 11.0], [12.0, 0.0]])
+
+        with patch(
+            "orbit.services.planner.routing.get_route_matrix_osrm", return_value=table
+        ) as mock_table, patch(
+            "orbit.services.planner.routing.get_route"
+        ) as mock_route:
+            result = planner.generate_plan(date.today(), sample_settings)
+
+        mock_table.assert_called_once()
+        mock_route.assert_not_called()
+        travel = [item for item in result.items if item.type == "travel"]
+        assert [(item.travel_minutes, item.distance_km) for item in travel] == [
+            (11, 4.2),
+            (12, 4.4),
+        ]
+
+    def test_routes_each_leg_once(self, sample_settings, sample_tasks):
+        """Test that route lookups are memoized across plan generations."""
+        today = date.today()
+        planner._cached_route.cache_clear()
+
+        def osrm_route(*coords):
+            return routing.get_route_fallback(*coords).model_copy(update={"source": "osrm"})
+
+        with patch(
+            "orbit.services.planner.routing.get_route_matrix_osrm", return_value=None
+        ), patch(
+            "orbit.services.planner.routing.get_route", side_effect=osrm_route,
+        ) as mock_route:
+            planner.generate_plan(today, sample_settings)
+            first_calls = mock_route.call_count
+            planner.generate_plan(today, sample_settings)
+
+        legs = [call.args for call in mock_route.call_args_list]
+        assert len(legs) == len(set(legs))
+        assert mock_route.call_count == first_calls
+
+    def test_fallback_routes_not_memoized(self, sample_settings, sample_tasks):
+        """Test that haversine estimates are routed again on the next plan."""
+        today = date.today()
+        planner._cached_route.cache_clear()
+
+        with patch(
+            "orbit.services.planner.routing.get_route_matrix_osrm", return_value=None
+        ), patch(
+            "orbit.services.planner.routing.get_route",
+            side_effect=routing.get_route_fallback,
+        ) as mock_route:
+            planner.generate_plan(today, sample_settings)
+            first_calls = mock_route.call_count
+            planner.generate_plan(today, sample_settings)
+
+        assert first_calls > 0
+        assert mock_route.call_count == 2 * first_calls
+
+
+class TestGeneratePlansBatch:
+    """Tests for multi-date plan generation."""
+
+    def test_matches_single_plans(self, sample_settings, sample_tasks):
+        """Test that batch plans come back in order and match single runs."""
+        today = date.today()
+        dates = [today + timedelta(days=offset) for offset in range(3)]
+
+        results = planner.generate_plans_batch(dates, sample_settings)
+
+        assert [r.plan.plan_date for r in results] == dates
+        for plan_date, result in zip(dates, results):
+            single = planner.generate_plan(plan_date, sample_settings)
+            assert [(i.type, i.start, i.end) for i in result.items] == [
+                (i.type, i.start, i.end) for i in single.items
+            ]
+            assert db.get_plan_items(result.plan.id)
+
+
+class TestGenerateSuggestions:
+    """Tests for overtime suggestions."""
+
+    def test_drop_counts_adjacent_travel(self):
+        """Test that a drop suggestion includes travel on both sides."""
+        start = datetime(2026, 1, 5, 9, 0)
+        task = Task(title="Dentist", priority=1, duration_minutes=30)
+        scheduled = [
+            planner.ScheduledItem(
+                type="travel", start=start, end=start + timedelta(minutes=20),
+                title="Drive to Dentist", travel_minutes=20,
+            ),
+            planner.ScheduledItem(
+                type="task", start=start + timedelta(minutes=20),
+                end=start + timedelta(minutes=50), title="Dentist", task=task,
+            ),
+            planner.ScheduledItem(
+                type="travel", start=start + timedelta(minutes=50),
+                end=start + timedelta(minutes=60), title="Return home",
+                travel_minutes=10,
+            ),
+        ]
+
+        suggestions = planner.generate_suggestions(
+            scheduled, [], start, start + timedelta(minutes=30), 30
+        )
+
+        assert "Drop 'Dentist' (priority 1, saves ~60 min)" in suggestions
+
 
 class TestGetRouteWaypoints:
     """Tests for route waypoints extraction."""
@@ -334,3 +653,18 @@ class TestGetRouteWaypoints:
         # First waypoint should be home
         assert waypoints[0][0] == sample_settings.home_lat
         assert waypoints[0][1] == sample_settings.home_lon
+
+    def test_ends_at_home_when_returning(self, sample_settings, sample_tasks):
+        """Test that the route closes at home only when the plan returns."""
+        today = date.today()
+
+        result = planner.generate_plan(today, sample_settings, return_home=True)
+        waypoints = planner.get_route_waypoints(result, sample_settings)
+
+        assert result.ends_at_home
+        assert waypoints[-1][:2] == (sample_settings.home_lat, sample_settings.home_lon)
+
+        result = planner.generate_plan(today, sample_settings, return_home=False)
+
+        assert not result.ends_at_home
+        assert not any(item.to_place == sample_settings.home_name for item in result.items)
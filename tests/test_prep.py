@@ -1,8 +1,11 @@
 """Tests for the prep notes service."""
 
+from unittest.mock import patch
+
 import pytest
 
-from orbit.services.prep import get_prep_notes, format_prep_notes, PrepNote
+from orbit.services import prep as prep_service
+from orbit.services.prep import get_prep_notes, format_prep_notes, PrepNote, _matched_keywords
 
 
 class TestGetPrepNotes:
@@ -57,6 +60,13 @@ class TestGetPrepNotes:
         prep = get_prep_notes("license renewal", "DMV")
         assert prep.crowdedness_hint is not None
 
+    def test_repeated_lookup_is_cached(self):
+        """Same purpose and place should return the same frozen note."""
+        prep = get_prep_notes("return item", "Target")
+        assert get_prep_notes("return item", "Target") is prep
+        with pytest.raises(AttributeError):
+            prep.tips = ()
+
     def test_crowdedness_hint_for_grocery(self):
         """Grocery should have crowdedness hint."""
         prep = get_prep_notes("grocery shopping", "Walmart")
@@ -111,6 +121,28 @@ class TestFormatPrepNotes:
         assert "Crowdedness" in formatted
         assert "Busy on weekends" in formatted
 
+    def test_format_separates_sections(self):
+        """Sections should be separated by one blank line."""
+        prep = PrepNote(
+            documents=["Photo ID"],
+            items=[],
+            tips=["Arrive early"],
+            crowdedness_hint="Busy on weekends",
+        )
+        formatted = format_prep_notes(prep)
+        assert formatted == (
+            "**Documents to bring:**\n- Photo ID\n\n"
+            "**Tips:**\n- Arrive early\n\n"
+            "**Crowdedness:** Busy on weekends"
+        )
+
+    def test_format_accepts_list_fields(self):
+        """Notes built from lists should format and cache like tuples."""
+        from_lists = PrepNote(documents=["Photo ID"], items=[], tips=[])
+        from_tuples = PrepNote(documents=("Photo ID",), items=(), tips=())
+        assert from_lists == from_tuples
+        assert format_prep_notes(from_lists) is format_prep_notes(from_tuples)
+
     def test_format_empty_prep(self):
         """Format should handle empty prep notes."""
         prep = PrepNote(
@@ -138,3 +170,45 @@ class TestMultipleMatches:
         id_items = [d for d in prep.documents if "ID" in d or "license" in d.lower()]
         # Should not have duplicates
         assert len(id_items) == len(set(id_items))
+
+    def test_matches_keywords_inside_words(self):
+        """Keywords match as substrings, overlapping ones included."""
+        assert _matched_keywords("email package at post office") == {
+            "mail", "package", "post office",
+        }
+
+    def test_matches_keywords_sharing_letters(self):
+        """Keywords that overlap in the text are both found."""
+        assert _matched_keywords("doctoreturn") == {"doctor", "return"}
+
+
+class TestKeywordMatchers:
+    """Tests that the Aho-Corasick and regex matchers agree."""
+
+    TEXTS = [
+        "email package at post office",
+        "doctoreturn",
+        "dmv license renewal registration",
+        "pick up dry cleaning and oil change",
+        "nothing relevant here",
+    ]
+
+    def test_automaton_path(self):
+        """The Aho-Corasick automaton finds every keyword."""
+        ahocorasick = pytest.importorskip("ahocorasick")
+        with patch.object(prep_service, "ahocorasick", ahocorasick):
+            automaton = prep_service._build_keyword_automaton()
+        assert automaton is not None
+
+        with patch.object(prep_service, "_KEYWORD_AUTOMATON", automaton):
+            found = [_matched_keywords(text) for text in self.TEXTS]
+        with patch.object(prep_service, "_KEYWORD_AUTOMATON", None):
+            expected = [_matched_keywords(text) for text in self.TEXTS]
+
+        assert found == expected
+        assert found[0] == {"mail", "package", "post office"}
+
+    def test_regex_fallback_path(self):
+        """Without the automaton the regex still finds overlapping keywords."""
+        with patch.object(prep_service, "_KEYWORD_AUTOMATON", None):
+            assert _matched_keywords("doctoreturn") == {"doctor", "return"}
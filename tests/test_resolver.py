@@ -4,18 +4,23 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from orbit.models import Settings, PlaceSearchResult
+from orbit.services import resolver
 from orbit.services.resolver import (
     normalize_text,
     calculate_name_similarity,
+    calculate_name_similarities,
     calculate_distance_miles,
     calculate_combined_score,
     score_candidates,
     should_auto_select,
     resolve_place,
+    resolve_multiple,
     select_candidate,
     apply_home_proximity_tiebreak,
     select_best_for_route,
     are_same_brand,
+    same_brand_flags,
+    filter_osm_results,
     ResolutionDecision,
     ScoredCandidate,
     ResolvedPlace,
@@ -23,6 +28,14 @@ from orbit.services.resolver import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_lookup_cache():
+    """Start each test with no memoized place lookups."""
+    resolver._LOOKUP_MEMO.clear()
+    yield
+    resolver._LOOKUP_MEMO.clear()
+
+
 class TestNormalizeText:
     """Tests for text normalization."""
 
@@ -67,6 +80,13 @@ class TestFuzzyMatching:
         similarity = calculate_name_similarity("Great Clips", "Great Clips Hair Salon")
         assert similarity >= 70.0
 
+    def test_score_cutoff(self):
+        """Test scores below the cutoff are 0 and the rest are unchanged."""
+        full = calculate_name_similarity("crumbl cookiee", "Crumbl Cookies")
+
+        assert calculate_name_similarity("crumbl cookiee", "Crumbl Cookies", score_cutoff=70) == full
+        assert calculate_name_similarity("Target", "Walmart", score_cutoff=70) == 0.0
+
     def test_no_match(self):
         """Test dissimilar names have lower scores than similar ones."""
         similar = calculate_name_similarity("Target", "Target Store")
@@ -80,6 +100,12 @@ class TestFuzzyMatching:
         similarity = calculate_name_similarity("starbuks", "Starbucks")
         assert similarity >= 70.0
 
+    def test_batch_matches_single(self):
+        """Test batch similarities equal one-at-a-time similarities."""
+        names = ["Starbucks", "Starbucks Reserve", "Whole Foods", "", "STAR-BUCKS!"]
+        batch = calculate_name_similarities("starbuks", names)
+        assert batch == [calculate_name_similarity("starbuks", n) for n in names]
+
 
 class TestDistanceScoring:
     """Tests for distance and combined scoring."""
@@ -109,6 +135,112 @@ class TestDistanceScoring:
         assert 50 < score < 70
 
 
+class TestFilterOsmResults:
+    """Tests for dropping obviously wrong OSM results."""
+
+    def _result(self, name, address, lat=30.55, lon=-97.55):
+        return PlaceSearchResult(
+            name=name, address=address, lat=lat, lon=lon, source="nominatim",
+        )
+
+    def test_drops_other_countries(self):
+        """Results in another country are dropped for a US home."""
+        results = [
+            self._result("Tim Hortons", "1 Main St, Windsor, Ontario, Canada"),
+            self._result("Target", "123 Main St, Hutto, TX, United States"),
+        ]
+
+        filtered = filter_osm_results(results, 30.54, -97.54)
+
+        assert [r.name for r in filtered] == ["Target"]
+
+    def test_keeps_home_country(self):
+        """Results in the home country are kept."""
+        results = [self._result("Tim Hortons", "1 Main St, Windsor, Ontario, CANADA")]
+
+        filtered = filter_osm_results(
+            results, 30.54, -97.54, home_address="2 Oak St, Windsor, Canada",
+        )
+
+        assert filtered == results
+
+    def test_keeps_new_mexico(self):
+        """A US result in New Mexico is kept for a Texas home."""
+        results = [
+            self._result(
+                "Walmart", "1 Main St, Sunland Park, New Mexico, United States",
+                lat=31.80, lon=-106.58,
+            )
+        ]
+
+        filtered = filter_osm_results(
+            results, 31.76, -106.49, home_address="100 Oak St, El Paso, TX",
+        )
+
+        assert filtered == results
+
+    def test_keeps_mexico_missouri(self):
+        """A result in Mexico, Missouri is kept for a Missouri home."""
+        results = [
+            self._result(
+                "Walmart", "1 Main St, Mexico, Missouri", lat=39.17, lon=-91.88,
+            )
+        ]
+
+        filtered = filter_osm_results(
+            results, 39.15, -91.90, home_address="100 Oak St, Mexico, MO",
+        )
+
+        assert filtered == results
+
+    def test_drops_localized_mexico(self):
+        """A Tijuana result with Nominatim's "México" is dropped for San Diego."""
+        results = [
+            self._result(
+                "OXXO",
+                "OXXO, Avenida Revolución, Zona Centro, Tijuana, "
+                "Baja California, 22000, México",
+                lat=32.53, lon=-117.04,
+            ),
+            self._result(
+                "Target", "Target, 1288 Camino del Rio N, San Diego, "
+                "California, 92108, United States",
+                lat=32.77, lon=-117.15,
+            ),
+        ]
+
+        filtered = filter_osm_results(results, 32.72, -117.16)
+
+        assert [r.name for r in filtered] == ["Target"]
+
+    def test_drops_localized_ireland(self):
+        """A result ending in "Éire / Ireland" is dropped for a US home."""
+        results = [
+            self._result(
+                "Tesco",
+                "Tesco, Baggot Street Lower, Dublin 2, Dublin, "
+                "County Dublin, Leinster, D02 X658, Éire / Ireland",
+            )
+        ]
+
+        assert filter_osm_results(results, 30.54, -97.54) == []
+
+    def test_drops_by_country_code(self):
+        """The result's country code is used when the source gave one."""
+        result = PlaceSearchResult(
+            name="OXXO", address="OXXO, Zona Centro, Tijuana, Baja California",
+            lat=32.53, lon=-117.04, country_code="mx",
+        )
+
+        assert filter_osm_results([result], 32.72, -117.16) == []
+
+    def test_drops_far_results(self):
+        """Results beyond the distance limit are dropped."""
+        results = [self._result("Target", "Dallas, TX", lat=32.7767, lon=-96.7970)]
+
+        assert filter_osm_results(results, 30.54, -97.54) == []
+
+
 class TestNearestStorePreference:
     """Tests for nearest store preference - the Great Clips issue."""
 
@@ -172,6 +304,23 @@ class TestNearestStorePreference:
         # Closer location should win
         assert scored[0].distance_miles < scored[1].distance_miles
 
+    def test_scores_match_combined_score(self):
+        """Scores match calculate_combined_score, including past 25 miles."""
+        candidates = [
+            PlaceSearchResult(
+                name=name, address="Somewhere", lat=lat, lon=-97.54, source="nominatim",
+            )
+            for name, lat in [("Great Clips", 30.55), ("Supercuts", 30.8), ("Great Clips", 31.2)]
+        ]
+
+        scored = score_candidates("great clips", candidates, 30.54, -97.54)
+
+        for c in scored:
+            distance = calculate_distance_miles(30.54, -97.54, c.place.lat, c.place.lon)
+            similarity = calculate_name_similarity("great clips", c.place.name)
+            expected = calculate_combined_score(distance, similarity)
+            assert c.combined_score == round(expected, 1)
+
 
 class TestAutoSelect:
     """Tests for auto-selection logic."""
@@ -342,6 +491,133 @@ class TestResolvePlace:
         assert result.selected is None
 
 
+class TestTierShortCircuit:
+    """Tests for skipping the network tiers on a clear OSM winner."""
+
+    def _results(self, second_name, second_lat):
+        return [
+            PlaceSearchResult(
+                name="Target", address="123 Main St", lat=30.541, lon=-97.541,
+                source="nominatim",
+            ),
+            PlaceSearchResult(
+                name=second_name, address="9 Oak Rd", lat=second_lat, lon=-97.541,
+                source="nominatim",
+            ),
+        ]
+
+    @patch('orbit.services.resolver.should_use_google_places', create=True)
+    @patch('orbit.services.resolver.GOOGLE_PLACES_AVAILABLE', True)
+    @patch('orbit.services.resolver.places.search_places_nearby')
+    def test_clear_winner_skips_google(self, mock_search, mock_should_google):
+        """A strong, clear OSM winner is selected without asking Google."""
+        mock_search.return_value = self._results("Joe's Garage", 30.70)
+        settings = Settings(home_lat=30.54, home_lon=-97.54, home_address="Home")
+
+        result = resolve_place("Target", settings)
+
+        mock_should_google.assert_not_called()
+        assert result.decision == ResolutionDecision.AUTO_BEST
+        assert result.selected.display_name == "Target"
+
+    @patch('orbit.services.resolver.should_use_google_places', create=True, return_value=False)
+    @patch('orbit.services.resolver.GOOGLE_PLACES_AVAILABLE', True)
+    @patch('orbit.services.resolver.places.search_places_nearby')
+    def test_close_call_still_asks_google(self, mock_search, mock_should_google):
+        """Without a clear winner the Google tier is still consulted."""
+        mock_search.return_value = self._results("Target", 30.542)
+        settings = Settings(home_lat=30.54, home_lon=-97.54, home_address="Home")
+
+        resolve_place("Target", settings)
+
+        mock_should_google.assert_called_once()
+
+
+class TestResolveMultiple:
+    """Tests for resolving several queries."""
+
+    @patch('orbit.services.resolver.places.search_places_nearby')
+    def test_keeps_query_order_and_skips_blanks(self, mock_search):
+        """Test results follow query order and blank queries are dropped."""
+        mock_search.side_effect = lambda query, *args, **kwargs: [
+            PlaceSearchResult(
+                name=query,
+                address="123 Main St",
+                lat=30.55,
+                lon=-97.55,
+                source="nominatim",
+            )
+        ]
+
+        settings = Settings(
+            home_lat=30.54,
+            home_lon=-97.54,
+            home_address="Home",
+        )
+
+        queries = ["Target", "  ", "Starbucks", "Great Clips", "Costco", "HEB"]
+        results = resolve_multiple(queries, settings)
+
+        assert [r.query for r in results] == [
+            "Target", "Starbucks", "Great Clips", "Costco", "HEB",
+        ]
+        assert all(r.selected.display_name == r.query for r in results)
+
+
+class TestLookupMemoization:
+    """Tests for the memoized network tiers."""
+
+    @patch('orbit.services.resolver.places.search_places_nearby')
+    def test_repeat_query_skips_search(self, mock_search):
+        """A repeated query near the same home is served from memory."""
+        mock_search.return_value = [
+            PlaceSearchResult(
+                name="Target",
+                address="123 Main St",
+                lat=30.55,
+                lon=-97.55,
+                source="nominatim",
+            )
+        ]
+        settings = Settings(home_lat=30.54, home_lon=-97.54, home_address="Home")
+
+        first = resolve_place("Target", settings)
+        second = resolve_place("  Target ", settings)
+
+        assert mock_search.call_count == 1
+        assert second.selected.place == first.selected.place
+        assert second.selected.place is not first.selected.place
+
+    @patch('orbit.services.resolver.places.geocode_address', return_value=None)
+    @patch('orbit.services.resolver.places.search_places_nearby', return_value=[])
+    def test_miss_is_not_memoized(self, mock_search, mock_geocode):
+        """A query that finds nothing is looked up again next time."""
+        settings = Settings(home_lat=30.54, home_lon=-97.54, home_address="Home")
+
+        resolve_place("Nowhere", settings)
+        calls = mock_search.call_count
+        resolve_place("Nowhere", settings)
+
+        assert mock_search.call_count == 2 * calls
+
+    @patch('orbit.services.resolver.places.search_places_nearby')
+    def test_searches_from_exact_home(self, mock_search):
+        """Only the memo key is rounded; the search uses the exact home."""
+        mock_search.return_value = [
+            PlaceSearchResult(
+                name="Target", address="123 Main St", lat=30.55, lon=-97.55,
+            )
+        ]
+        settings = Settings(home_lat=30.54449, home_lon=-97.54449, home_address="Home")
+
+        resolve_place("Target", settings)
+        nearby = Settings(home_lat=30.5441, home_lon=-97.5441, home_address="Home")
+        resolve_place("Target", nearby)
+
+        assert mock_search.call_count == 1
+        assert mock_search.call_args.args[1:3] == (30.54449, -97.54449)
+
+
 class TestSelectCandidate:
     """Tests for user candidate selection."""
 
@@ -521,6 +797,28 @@ class TestSameBrandDetection:
         )
         assert are_same_brand(c1, c2) is False
 
+    def test_batch_flags_match_pairwise(self):
+        """Batch same-brand flags agree with are_same_brand."""
+        candidates = [
+            ScoredCandidate(
+                place=PlaceSearchResult(
+                    name=name,
+                    address="123 Main St",
+                    lat=30.5, lon=-97.5,
+                    source="test",
+                ),
+                distance_miles=2.0,
+                name_similarity=80.0,
+                combined_score=80.0,
+            )
+            for name in ["Great Clips", "Great Clips Hair Salon", "Target", ""]
+        ]
+        top = candidates[0]
+        assert same_brand_flags(top, candidates) == [
+            are_same_brand(top, c) for c in candidates
+        ]
+        assert same_brand_flags(top, candidates) == [True, True, False, False]
+
 
 class TestHomeProximityTiebreak:
     """Tests for home proximity tie-break selection."""
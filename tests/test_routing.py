@@ -1,6 +1,9 @@
 """Tests for the routing service."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
+import requests
 
 from orbit.services import routing
 
@@ -39,6 +42,34 @@ class TestHaversineDistance:
         assert 110 < dist < 130
 
 
+class TestHaversineDistances:
+    """Tests for one-to-many haversine distances."""
+
+    def test_matches_pairwise(self):
+        """Batch distances match individual haversine calls."""
+        points = [(30.0, -97.0), (30.2672, -97.7431), (32.7767, -96.7970)]
+
+        distances = routing.haversine_distances(30.1, -97.2, points)
+
+        assert len(distances) == 3
+        for (lat, lon), dist in zip(points, distances):
+            assert dist == pytest.approx(routing.haversine_distance(30.1, -97.2, lat, lon))
+
+    def test_empty_points(self):
+        """No points gives no distances."""
+        assert routing.haversine_distances(30.0, -97.0, []) == []
+
+    def test_radius_sets_unit(self):
+        """Passing the radius in miles scales the distances to miles."""
+        points = [(30.2672, -97.7431), (32.7767, -96.7970)]
+        radius_miles = routing.EARTH_RADIUS_KM * 0.621371
+
+        km = routing.haversine_distances(30.1, -97.2, points)
+        miles = routing.haversine_distances(30.1, -97.2, points, radius=radius_miles)
+
+        assert miles == pytest.approx([d * 0.621371 for d in km])
+
+
 class TestFallbackRoute:
     """Tests for fallback routing."""
 
@@ -140,6 +171,113 @@ class TestDistanceMatrix:
         assert abs(distances[0][1] - distances[1][0]) < 1.0  # Within 1 km
 
 
+class TestRouteMatrixOsrm:
+    """Tests for the OSRM table lookup."""
+
+    def _response(self, payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+    def test_converts_units(self):
+        """Test meters/seconds are converted to km/minutes in one request."""
+        payload = {
+            "code": "Ok",
+            "distances": [[0, 1234.5], [1500, 0]],
+            "durations": [[0, 600], [630, 0]],
+        }
+
+        with patch("orbit.services.routing.requests.get", return_value=self._response(payload)) as mock_get:
+            table = routing.get_route_matrix_osrm([(30.0, -97.0), (30.1, -97.1)])
+
+        assert mock_get.call_count == 1
+        assert "/table/v1/driving/-97.0,30.0;-97.1,30.1" in mock_get.call_args.args[0]
+        assert table == ([[0.0, 1.23], [1.5, 0.0]], [[0.0, 10.0], [10.5, 0.0]])
+
+    def test_unroutable_pair_returns_none(self):
+        """Test that a null entry makes the whole table unavailable."""
+        payload = {
+            "code": "Ok",
+            "distances": [[0, None], [1500, 0]],
+            "durations": [[0, None], [630, 0]],
+        }
+
+        with patch("orbit.services.routing.requests.get", return_value=self._response(payload)):
+            assert routing.get_route_matrix_osrm([(30.0, -97.0), (30.1, -97.1)]) is None
+
+    def test_network_error_returns_none(self):
+        """Test that request failures fall back to None."""
+        with patch(
+            "orbit.services.routing.requests.get",
+            side_effect=requests.exceptions.ConnectionError("down"),
+        ):
+            assert routing.get_route_matrix_osrm([(30.0, -97.0), (30.1, -97.1)]) is None
+
+
+class TestLegRoutes:
+    """Tests for cache-first leg lookups."""
+
+    LOCATIONS = [(30.0, -97.0), (30.1, -97.1), (30.2, -97.2)]
+
+    def test_table_legs_are_cached(self):
+        """Test that /table legs are written back, so a warm cache skips the network."""
+        table = ([[0.0, 4.2], [4.4, 0.0]], [[0.0, 11.0], [12.0, 0.0]])
+
+        with patch("orbit.services.routing.get_route_matrix_osrm", return_value=table):
+            found, missing = routing.get_leg_routes(self.LOCATIONS[:2], [(0, 1), (1, 0)])
+
+        assert found == {(0, 1): (11.0, 4.2), (1, 0): (12.0, 4.4)}
+        assert missing == []
+
+        with patch("orbit.services.routing.get_route_matrix_osrm") as mock_table, patch(
+            "orbit.services.routing.requests.get"
+        ) as mock_get:
+            assert routing.get_route(30.0, -97.0, 30.1, -97.1).duration_minutes == 11.0
+            found, _ = routing.get_leg_routes(self.LOCATIONS[:2], [(0, 1), (1, 0)])
+
+        mock_table.assert_not_called()
+        mock_get.assert_not_called()
+        assert found == {(0, 1): (11.0, 4.2), (1, 0): (12.0, 4.4)}
+
+    def test_table_only_for_missing_legs(self):
+        """Test that only locations with uncached legs go to /table."""
+        with patch("orbit.services.routing.get_route_osrm", return_value=None):
+            routing.get_route(30.0, -97.0, 30.1, -97.1)  # Caches the fallback leg
+        table = ([[0.0, 7.0], [7.5, 0.0]], [[0.0, 15.0], [16.0, 0.0]])
+
+        with patch(
+            "orbit.services.routing.get_route_matrix_osrm", return_value=table
+        ) as mock_table:
+            found, missing = routing.get_leg_routes(self.LOCATIONS, [(0, 1), (0, 2), (2, 0)])
+
+        mock_table.assert_called_once_with([self.LOCATIONS[0], self.LOCATIONS[2]])
+        assert found[(0, 2)] == (15.0, 7.0)
+        assert found[(2, 0)] == (16.0, 7.5)
+        assert missing == []
+
+    def test_unknown_legs_without_table(self):
+        """Test that legs OSRM can't table are handed back to the caller."""
+        with patch("orbit.services.routing.get_route_matrix_osrm", return_value=None):
+            found, missing = routing.get_leg_routes(self.LOCATIONS[:2], [(0, 1)])
+
+        assert found == {}
+        assert missing == [(0, 1)]
+
+    def test_geometry_request_keeps_table_leg_when_osrm_fails(self):
+        """Test that a failed /route call doesn't replace a cached /table leg."""
+        table = ([[0.0, 4.2], [4.4, 0.0]], [[0.0, 11.0], [12.0, 0.0]])
+        with patch("orbit.services.routing.get_route_matrix_osrm", return_value=table):
+            routing.get_leg_routes(self.LOCATIONS[:2], [(0, 1)])
+
+        with patch("orbit.services.routing.get_route_osrm", return_value=None):
+            route = routing.get_route(30.0, -97.0, 30.1, -97.1, need_geometry=True)
+
+        assert route.source == "osrm"
+        assert route.geometry is None
+        assert route.duration_minutes == 11.0
+        assert routing.get_route(30.0, -97.0, 30.1, -97.1).source == "osrm"
+
+
 class TestTotalRouteDistance:
     """Tests for total route distance calculation."""
 